@@ -1,14 +1,26 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import os
 import io
 import re
+import sys
+import json
+import math
 import pickle
+import threading
+import time
+import numpy as np
 import xgboost as xgb
 import pandas as pd
-import pdfplumber
 from werkzeug.utils import secure_filename
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from shared.text_extraction import extract_text
+from shared.skills import taxonomy
+from shared.sections import segment
+
 app = Flask(__name__)
 CORS(app)
 
@@ -25,34 +37,115 @@ education_encoder_path = "C:/Users/vanshika/Downloads/ats score checker-20250507
 scaler_path = "C:/Users/vanshika/Downloads/ats score checker-20250507T140126Z-1-001/ats score checker/scaler.pkl"
 
 
-# Load models and encoders at startup
+# A batch request's pending resumes are scored with one booster call once
+# there are this many, or once the oldest has waited this long
+BATCH_CHUNK_SIZE = 256
+BATCH_FLUSH_SECONDS = 0.25
+
+# Models and encoders, loaded by load_models before the first request
 model = None
 skill_encoder = None
 education_encoder = None
 scaler = None
+feature_layout = None
+_models_lock = threading.Lock()
+
+
+class FeatureLayout:
+    """Column positions of every encoded feature in the booster's input order.
+
+    Compiled once in load_models. Batches write the encoders' output straight
+    into these positions of a numpy matrix; single rows skip the encoders and
+    pandas altogether and are filled from the skill and education indexes and
+    the scaler's constants into a reusable per-thread row.
+    """
+
+    def __init__(self, booster, skill_classes, education_classes, scaler):
+        self.booster = booster
+        self.skill_classes = [str(c) for c in skill_classes]
+        self.education_classes = [str(c) for c in education_classes]
+        frame_order = self.skill_classes + self.education_classes + ['experience']
+        # Booster trained on a DataFrame knows its column order; otherwise it
+        # is the order predict_ats_score builds the frame in
+        columns = list(booster.feature_names or frame_order)
+        position = {name: i for i, name in enumerate(columns)}
+        self.n_features = len(columns)
+        self.skill_columns = np.array([position[c] for c in self.skill_classes], dtype=np.intp)
+        self.education_columns = np.array([position[c] for c in self.education_classes], dtype=np.intp)
+        self.experience_column = position['experience']
+
+        self.skill_index = dict(zip(self.skill_classes, self.skill_columns.tolist()))
+        self.education_index = dict(zip(self.education_classes, self.education_columns.tolist()))
+        # Experience scaling is affine (x - mean) / scale; read it off the
+        # fitted scaler once so any linear scaler reduces to two constants
+        offset, one = scaler.transform([[0.0], [1.0]])[:, 0]
+        self.experience_offset = float(offset)
+        self.experience_slope = float(one - offset)
+        self._local = threading.local()
+
+    def matrix(self, n_rows):
+        return np.zeros((n_rows, self.n_features), dtype=np.float32)
+
+    def row(self, skills, experience, education):
+        """The features of one resume in this thread's reusable 1-row buffer"""
+        row = getattr(self._local, 'row', None)
+        if row is None:
+            row = self._local.row = self.matrix(1)
+        row.fill(0)
+        values = row[0]
+        for skill in skills:
+            column = self.skill_index.get(skill)
+            if column is not None:
+                values[column] = 1
+        column = self.education_index.get(education[0])
+        if column is not None:
+            values[column] = 1
+        values[self.experience_column] = float(experience) * self.experience_slope + self.experience_offset
+        return row
+
+    def predict(self, skills, experience, education):
+        return float(self.booster.inplace_predict(self.row(skills, experience, education))[0])
+
+
+def _dense(encoded):
+    return encoded.toarray() if hasattr(encoded, 'toarray') else np.asarray(encoded)
+
 
 def load_models():
-    global model, skill_encoder, education_encoder, scaler
-    try:
-        model = xgb.XGBRegressor()
-        model.load_model(model_path)
+    """Load the model and encoders once; later calls return immediately"""
+    global model, skill_encoder, education_encoder, scaler, feature_layout
+    if feature_layout is not None:
+        return
+    with _models_lock:
+        if feature_layout is not None:
+            return
+        try:
+            model = xgb.XGBRegressor()
+            model.load_model(model_path)
 
-        with open(skill_encoder_path, 'rb') as f:
-            skill_encoder = pickle.load(f)
+            with open(skill_encoder_path, 'rb') as f:
+                skill_encoder = pickle.load(f)
 
-        with open(education_encoder_path, 'rb') as f:
-            education_encoder = pickle.load(f)
+            with open(education_encoder_path, 'rb') as f:
+                education_encoder = pickle.load(f)
 
-        with open(scaler_path, 'rb') as f:
-            scaler = pickle.load(f)
+            with open(scaler_path, 'rb') as f:
+                scaler = pickle.load(f)
 
-        print("Model and encoders loaded successfully.")
-    except Exception as e:
-        print(f"Error loading models: {str(e)}")
-        raise
+            # Set last: a non-None layout means everything above is loaded
+            feature_layout = FeatureLayout(model.get_booster(), skill_encoder.classes_,
+                                           education_encoder.classes_, scaler)
+
+            print("Model and encoders loaded successfully.")
+        except Exception as e:
+            print(f"Error loading models: {str(e)}")
+            raise
 
-# Load models when the app starts
-load_models()
+
+# Loaded on the first request (or by __main__ at start-up), not at import
+@app.before_request
+def ensure_models():
+    load_models()
 
 def allowed_file(filename):
     return '.' in filename and \
@@ -64,25 +157,41 @@ def extract_resume_data(resume_text):
         'python', 'java', 'c++', 'sql', 'html', 'css', 'javascript',
         'machine learning', 'deep learning', 'tensorflow', 'keras', 'pandas', 'numpy'
     ]
-    skills = [skill for skill in skill_keywords if skill.lower() in resume_text.lower()]
+    # Canonical taxonomy names are the skill encoder's class names
+    found = set(taxonomy.skills(resume_text))
+    skills = [skill for skill in skill_keywords if skill in found]
     
+    # One segmentation (and lower-cased copy) shared with the checks below
+    sections = segment(resume_text)
+    text = sections.lower
+
     # Extract experience
-    experience_matches = re.findall(r'(\d+)\+?\s+years?', resume_text.lower())
-    experience = int(experience_matches[0]) if experience_matches else 0
+    experience_match = re.search(r'(\d+)\+?\s+years?', text)
+    experience = int(experience_match.group(1)) if experience_match else 0
     
-    # Extract education
-    if 'phd' in resume_text.lower():
-        education = ["PhD"]
-    elif 'master' in resume_text.lower():
-        education = ["Masters"]
-    elif 'bachelor' in resume_text.lower():
-        education = ["Bachelors"]
-    else:
-        education = ["Unknown"]
+    # Extract education, from the education section first, then the whole text
+    education = ["Unknown"]
+    for source in (sections.body('education', lower=True), text):
+        if 'phd' in source:
+            education = ["PhD"]
+        elif 'master' in source:
+            education = ["Masters"]
+        elif 'bachelor' in source:
+            education = ["Bachelors"]
+        else:
+            continue
+        break
     
     return skills, experience, education
 
 def predict_ats_score(skills, experience, education):
+    try:
+        return feature_layout.predict(skills, experience, education)
+    except Exception as e:
+        raise Exception(f"Prediction failed: {str(e)}")
+
+def predict_ats_score_pandas(skills, experience, education):
+    """Encoder and DataFrame based scoring, kept as the reference for bench_ats.py"""
     try:
         # Encode skills
         skills_encoded = pd.DataFrame(skill_encoder.transform([skills]), columns=skill_encoder.classes_)
@@ -108,6 +217,134 @@ def predict_ats_score(skills, experience, education):
     except Exception as e:
         raise Exception(f"Prediction failed: {str(e)}")
 
+def validate_features(record):
+    """(skills, experience, education) from a JSON feature record, or raise ValueError"""
+    if not isinstance(record, dict):
+        raise ValueError("Record must be an object")
+    missing = [key for key in ('skills', 'experience', 'education') if key not in record]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    skills, experience, education = record['skills'], record['experience'], record['education']
+    if not isinstance(skills, (list, tuple)) or not all(isinstance(s, str) for s in skills):
+        raise ValueError("skills must be a list of strings")
+    if isinstance(education, str):
+        education = [education]
+    if not isinstance(education, (list, tuple)) or not education or not isinstance(education[0], str):
+        raise ValueError("education must be a string or a non-empty list of strings")
+    if isinstance(experience, bool) or not isinstance(experience, (int, float, str)):
+        raise ValueError("experience must be a number")
+    try:
+        experience = float(experience)
+    except ValueError:
+        raise ValueError("experience must be a number")
+    if not math.isfinite(experience):
+        raise ValueError("experience must be a number")
+    return list(skills), experience, [education[0]]
+
+
+def encode_batch(features):
+    """One float32 feature matrix for [(skills, experience, education), ...]"""
+    X = feature_layout.matrix(len(features))
+    X[:, feature_layout.skill_columns] = _dense(skill_encoder.transform([f[0] for f in features]))
+    X[:, feature_layout.education_columns] = _dense(education_encoder.transform([[f[2][0]] for f in features]))
+    X[:, feature_layout.experience_column] = scaler.transform([[f[1]] for f in features])[:, 0]
+    return X
+
+
+def score_batch(features):
+    """ATS scores for many feature tuples with a single booster call"""
+    if not features:
+        return []
+    return feature_layout.booster.inplace_predict(encode_batch(features)).tolist()
+
+
+def batch_items():
+    """(id, features or None, error or None) for every resume in the request"""
+    files = request.files.getlist('files') + request.files.getlist('file')
+    if files:
+        for file in files:
+            try:
+                if not allowed_file(file.filename):
+                    raise ValueError("Invalid file type")
+                resume_text = extract_text(file.stream, filename=secure_filename(file.filename), sep="")
+                yield file.filename, extract_resume_data(resume_text), None
+            except Exception as e:
+                yield file.filename, None, str(e)
+        return
+
+    data = request.get_json(silent=True)
+    records = data.get('records') if isinstance(data, dict) else data
+    if not isinstance(records, list):
+        raise ValueError("Send resume files as 'files' or a JSON list of feature records")
+    for i, record in enumerate(records):
+        item_id = record.get('id', i) if isinstance(record, dict) else i
+        try:
+            yield item_id, validate_features(record), None
+        except (TypeError, ValueError) as e:
+            yield item_id, None, str(e)
+
+
+def score_stream(items):
+    """NDJSON lines: errors as soon as an item fails, scores once per chunk"""
+    scored = failed = 0
+    pending = []
+    pending_since = 0.0
+
+    def flush():
+        try:
+            scores = score_batch([features for _, _, features in pending])
+            results = [{'index': i, 'id': item_id, 'ats_score': float(score)}
+                       for (i, item_id, _), score in zip(pending, scores)]
+        except Exception:
+            # A bad record poisoned the bulk encode: score one by one
+            results = []
+            for i, item_id, features in pending:
+                try:
+                    results.append({'index': i, 'id': item_id, 'ats_score': float(score_batch([features])[0])})
+                except Exception as e:
+                    results.append({'index': i, 'id': item_id, 'error': f"Prediction failed: {str(e)}"})
+        pending.clear()
+        return results
+
+    for i, (item_id, features, error) in enumerate(items):
+        if error is not None:
+            failed += 1
+            yield json.dumps({'index': i, 'id': item_id, 'error': error}) + "\n"
+            continue
+        if not pending:
+            pending_since = time.monotonic()
+        pending.append((i, item_id, features))
+        # Slow items (file uploads) still produce scores while the rest extract
+        if len(pending) >= BATCH_CHUNK_SIZE or time.monotonic() - pending_since >= BATCH_FLUSH_SECONDS:
+            for result in flush():
+                scored += 'ats_score' in result
+                failed += 'error' in result
+                yield json.dumps(result) + "\n"
+    for result in flush():
+        scored += 'ats_score' in result
+        failed += 'error' in result
+        yield json.dumps(result) + "\n"
+    yield json.dumps({'done': True, 'scored': scored, 'errors': failed}) + "\n"
+
+
+@app.route('/api/check-ats/batch', methods=['POST'])
+def check_ats_batch():
+    """Score many resume files or JSON feature records, streamed as NDJSON"""
+    items = batch_items()
+    try:
+        first = next(items, None)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    if first is None:
+        return jsonify({'error': 'No resumes to score'}), 400
+
+    def all_items():
+        yield first
+        yield from items
+
+    return Response(stream_with_context(score_stream(all_items())), mimetype='application/x-ndjson')
+
+
 @app.route('/api/check-ats', methods=['POST'])
 def check_ats():
     if 'file' not in request.files:
@@ -119,21 +356,9 @@ def check_ats():
     
     if file and allowed_file(file.filename):
         try:
-            # Save the file temporarily
+            # Parse the resume in memory
             filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
-            # Parse the resume
-            if filename.endswith(".pdf"):
-                with pdfplumber.open(filepath) as pdf:
-                    resume_text = "".join([page.extract_text() or "" for page in pdf.pages])
-            else:
-                with open(filepath, 'r') as f:
-                    resume_text = f.read()
-            
-            # Clean up the temporary file
-            os.remove(filepath)
+            resume_text = extract_text(file.stream, filename=filename, sep="")
             
             # Extract features
             skills, experience, education = extract_resume_data(resume_text)
@@ -167,5 +392,6 @@ def predict_resume():
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
+    load_models()
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     app.run(debug=True, port=5006)
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""Parity check and latency benchmark for single-resume ATS scoring.
+
+Scores the same random feature records through the old encoder/DataFrame
+path (predict_ats_score_pandas) and the compiled-layout fast path
+(predict_ats_score), fails if any pair of scores disagrees, and reports
+per-call p50/p99 latency for both.
+
+    python bench_ats.py [records] [seed]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+import ats
+
+TOLERANCE = 1e-4
+
+
+def random_records(n, seed):
+    rng = random.Random(seed)
+    skills = list(ats.feature_layout.skill_classes) + ['cobol', 'fortran']  # plus unknown skills
+    education = list(ats.feature_layout.education_classes) + ['Diploma']
+    return [(rng.sample(skills, rng.randint(0, min(8, len(skills)))),
+             rng.choice([0, 1, 2, 3, 5, 8, 12, 20, rng.uniform(0, 25)]),
+             [rng.choice(education)])
+            for _ in range(n)]
+
+
+def latencies(score, records):
+    timings = []
+    for skills, experience, education in records:
+        start = time.perf_counter()
+        score(skills, experience, education)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+def main(n=2000, seed=0):
+    ats.load_models()
+    records = random_records(n, seed)
+
+    worst = 0.0
+    for record in records:
+        expected = ats.predict_ats_score_pandas(*record)
+        actual = ats.predict_ats_score(*record)
+        worst = max(worst, abs(expected - actual))
+        if abs(expected - actual) > TOLERANCE:
+            raise SystemExit(f"Mismatch for {record}: pandas {expected} vs fast {actual}")
+    print(f"parity: {n} records, max |difference| {worst:.2e}")
+
+    for name, score in (('pandas', ats.predict_ats_score_pandas), ('fast', ats.predict_ats_score)):
+        latencies(score, records[:50])  # warm up
+        ms = latencies(score, records)
+        print(f"{name:>7}: p50 {np.percentile(ms, 50):7.3f} ms  p99 {np.percentile(ms, 99):7.3f} ms")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
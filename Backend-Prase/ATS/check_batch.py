@@ -0,0 +1,151 @@
+"""Checks for the streaming batch endpoint, run against small stand-in models.
+
+Fits a skill and an education encoder, a scaler and a tiny XGBoost model in a
+temporary directory, points ats at them and streams feature records through
+/api/check-ats/batch:
+
+- malformed records (non-list skills, wrong education or experience types,
+  missing fields) get an error line each while every valid record around
+  them is still scored, with the same score as predict_ats_score;
+- a malformed first record is an error line, not a 500;
+- a slow item stream gets its first scores after BATCH_FLUSH_SECONDS
+  rather than after BATCH_CHUNK_SIZE items.
+
+    python check_batch.py
+"""
+import json
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.preprocessing import MultiLabelBinarizer, StandardScaler
+
+import ats
+
+TOLERANCE = 1e-4
+SKILLS = ['python', 'java', 'sql', 'html', 'css', 'javascript', 'machine learning', 'pandas']
+EDUCATION = ['PhD', 'Masters', 'Bachelors', 'Unknown']
+
+VALID = {'skills': ['python', 'sql'], 'experience': 3, 'education': 'Masters'}
+MALFORMED = [
+    {'skills': 'python', 'experience': 1, 'education': 'PhD'},
+    {'skills': 5, 'experience': 1, 'education': 'PhD'},
+    {'skills': None, 'experience': 1, 'education': 'PhD'},
+    {'skills': ['python', 3], 'experience': 1, 'education': 'PhD'},
+    {'skills': [], 'experience': 1, 'education': 7},
+    {'skills': [], 'experience': 1, 'education': []},
+    {'skills': [], 'experience': [1], 'education': 'PhD'},
+    {'skills': [], 'experience': True, 'education': 'PhD'},
+    {'skills': [], 'experience': 'ten', 'education': 'PhD'},
+    {'skills': [], 'education': 'PhD'},
+    42,
+]
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+
+
+def install_stand_in_models(directory, seed=0):
+    """Fit stand-in encoders and model under ``directory`` and load them into ats"""
+    rng = np.random.default_rng(seed)
+    skill_encoder = MultiLabelBinarizer().fit([SKILLS])
+    education_encoder = MultiLabelBinarizer().fit([[e] for e in EDUCATION])
+    experience = rng.uniform(0, 20, size=(200, 1))
+    scaler = StandardScaler().fit(experience)
+
+    skills = skill_encoder.transform([list(rng.choice(SKILLS, rng.integers(0, 5), replace=False)) for _ in range(200)])
+    education = education_encoder.transform([[rng.choice(EDUCATION)] for _ in range(200)])
+    columns = list(skill_encoder.classes_) + list(education_encoder.classes_) + ['experience']
+    X = pd.DataFrame(np.hstack([skills, education, scaler.transform(experience)]), columns=columns)
+    y = skills.sum(axis=1) * 5 + experience[:, 0] * 2 + rng.normal(0, 1, 200)
+    model = xgb.XGBRegressor(n_estimators=20, max_depth=3).fit(X, y)
+
+    ats.model_path = os.path.join(directory, 'ats_scoring_model.json')
+    model.save_model(ats.model_path)
+    for name, obj in (('skill_encoder_path', skill_encoder), ('education_encoder_path', education_encoder),
+                      ('scaler_path', scaler)):
+        path = os.path.join(directory, f"{name[:-5]}.pkl")
+        with open(path, 'wb') as f:
+            pickle.dump(obj, f)
+        setattr(ats, name, path)
+    ats.load_models()
+
+
+def post_records(client, records):
+    response = client.post('/api/check-ats/batch', json={'records': records})
+    check(response.status_code == 200, f"status {response.status_code}: {response.get_data(as_text=True)}")
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    check(lines and lines[-1].get('done'), "stream did not end with a done line")
+    return {line['index']: line for line in lines[:-1]}, lines[-1]
+
+
+def check_malformed_between_valid(client):
+    records = []
+    for bad in MALFORMED:
+        records += [VALID, bad]
+    records.append({**VALID, 'skills': ['java'], 'experience': '7', 'education': ['PhD']})
+    results, done = post_records(client, records)
+
+    check(sorted(results) == list(range(len(records))), "not every record got exactly one line")
+    expected = ats.predict_ats_score(['python', 'sql'], 3, ['Masters'])
+    for i, record in enumerate(records):
+        line = results[i]
+        if record in MALFORMED:
+            check('error' in line, f"record {i} ({record!r}) was not rejected: {line}")
+        else:
+            check('ats_score' in line, f"valid record {i} was not scored: {line}")
+    check(abs(results[0]['ats_score'] - expected) <= TOLERANCE,
+          f"batch score {results[0]['ats_score']} != single score {expected}")
+    last = ats.predict_ats_score(['java'], 7, ['PhD'])
+    check(abs(results[len(records) - 1]['ats_score'] - last) <= TOLERANCE, "string experience scored differently")
+    check(done['scored'] == len(MALFORMED) + 1 and done['errors'] == len(MALFORMED), f"wrong totals {done}")
+    print(f"malformed between valid: {done['scored']} scored, {done['errors']} rejected")
+
+
+def check_malformed_first(client):
+    for bad in MALFORMED:
+        results, done = post_records(client, [bad, VALID])
+        check('error' in results[0] and 'ats_score' in results[1], f"first record {bad!r}: {results}")
+    response = client.post('/api/check-ats/batch', json={'records': 5})
+    check(response.status_code == 400, f"non-list records: status {response.status_code}")
+    print(f"malformed first record: {len(MALFORMED)} cases answered 200 with an error line")
+
+
+def check_time_flush():
+    pulled = []
+    features = ats.validate_features(VALID)
+
+    def slow_items():
+        for i in range(3):
+            pulled.append(i)
+            yield i, features, None
+            time.sleep(ats.BATCH_FLUSH_SECONDS * 1.2)
+
+    stream = ats.score_stream(slow_items())
+    first = json.loads(next(stream))
+    arrived = len(pulled)
+    check('ats_score' in first, f"first line is not a score: {first}")
+    check(arrived < 3, "no score was streamed until every item had arrived")
+    rest = [json.loads(line) for line in stream]
+    check(rest[-1] == {'done': True, 'scored': 3, 'errors': 0}, f"wrong totals {rest[-1]}")
+    print(f"time flush: first score streamed after {arrived} of 3 slow items")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        install_stand_in_models(directory)
+        client = ats.app.test_client()
+        check_malformed_between_valid(client)
+        check_malformed_first(client)
+        check_time_flush()
+    print("ok")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Chart drawing for the skill gap analysis.
+
+Each ``draw_*`` function draws on the Figure it is given (object-oriented
+API only) and is rendered in a worker process by ``shared.rendering``.
+"""
+from matplotlib.patches import Patch
+
+PIE_COLORS = ['#4CAF50', '#2196F3', '#FFC107', '#FF5722', '#9C27B0']
+
+
+def draw_skill_match(fig, data):
+    """Matched / not matched bar per required skill"""
+    ax = fig.add_subplot()
+    skills = data['skills']
+    match_status = data['matched']
+    colors = ['#4CAF50' if matched else '#F44336' for matched in match_status]
+
+    bars = ax.bar(skills, [1] * len(skills), color=colors, edgecolor='black')
+
+    # Add value labels on bars
+    for bar, matched in zip(bars, match_status):
+        height = bar.get_height()
+        label = '✓' if matched else '✗'
+        ax.text(bar.get_x() + bar.get_width() / 2.0, height + 0.02, label,
+                ha='center', va='bottom', fontsize=12, weight='bold')
+
+    # Add legend
+    legend_elements = [
+        Patch(facecolor='#4CAF50', edgecolor='black', label='Matched'),
+        Patch(facecolor='#F44336', edgecolor='black', label='Not Matched')
+    ]
+    ax.legend(handles=legend_elements, loc='upper right', fontsize=10)
+
+    ax.set_title('Skill Match Overview', fontsize=16, pad=20, weight='bold')
+    ax.tick_params(axis='x', labelsize=10)
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_ha('right')
+    ax.set_yticks([])
+    ax.grid(axis='y', linestyle='--', alpha=0.6)
+    fig.tight_layout()
+
+
+def draw_tech_pie(fig, data):
+    """Share of each technology category found in the resume"""
+    ax = fig.add_subplot()
+    labels = data['labels']
+    sizes = data['sizes']
+
+    # Create pie chart with graduated explosion effect
+    explode = [0.05 if size > 30 else 0.01 for size in sizes]
+
+    wedges, texts, autotexts = ax.pie(
+        sizes,
+        explode=explode,
+        labels=labels,
+        colors=PIE_COLORS,
+        autopct='%1.1f%%',
+        shadow=True,
+        startangle=90,
+        textprops={'fontsize': 12, 'fontweight': 'bold'},
+        wedgeprops={'edgecolor': 'white', 'linewidth': 1.5}
+    )
+
+    # Style percentage text
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+
+    ax.axis('equal')
+    ax.set_title('Technology Category Distribution', fontsize=16, fontweight='bold', pad=20)
+
+    ax.legend(
+        [f"{labels[i]} ({sizes[i]}%)" for i in range(len(labels))],
+        loc="lower center",
+        bbox_to_anchor=(0.5, -0.15),
+        ncol=2
+    )
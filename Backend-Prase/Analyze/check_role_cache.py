@@ -0,0 +1,141 @@
+"""Checks for the role skill cache against a local job-board stand-in.
+
+Serves job postings (``.job-snippet`` elements, like the real board) from a
+local HTTP server that can be switched to failing with 503, points
+skill_gap_analyzer.JOB_BOARD_URL at it and runs a RoleSkillCache with its
+own database in a temporary directory through:
+
+- a cold miss: the fallback skills right away, the scraped ones after the
+  background refresh;
+- success: a fresh scraped profile served without calling the board;
+- upstream failure with stale data: the stale scraped profile keeps being
+  served;
+- upstream failure with no data: get_fallback_skills, stored as a fallback
+  profile and replaced once the board answers again.
+
+None of the gets may wait on the board, which answers after a delay.
+
+    python check_role_cache.py
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from tempfile import TemporaryDirectory
+
+import skill_gap_analyzer
+from role_skill_cache import RoleSkillCache, normalize_role
+from skill_gap_analyzer import extract_skills_from_job_postings, get_fallback_skills
+
+LATENCY = 0.3  # seconds the stand-in board takes to answer
+TTL = 1.0
+POSTINGS = [
+    "We need someone proficient in python with experience in docker and kubernetes.",
+    "Strong python, sql and aws; docker is a plus.",
+    "Experienced with terraform; python and docker every day.",
+]
+SCRAPED = ['python', 'docker', 'kubernetes', 'sql', 'amazon web services', 'terraform']
+
+
+class JobBoard(BaseHTTPRequestHandler):
+    failing = False
+    queries = []
+
+    def do_GET(self):
+        JobBoard.queries.append(self.path)
+        time.sleep(LATENCY)
+        if JobBoard.failing:
+            self.send_error(503)
+            return
+        body = "".join(f'<div class="job-snippet">{text}</div>' for text in POSTINGS).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+
+
+def timed_get(cache, role):
+    start = time.perf_counter()
+    skills = cache.get(role)
+    elapsed = time.perf_counter() - start
+    check(elapsed < LATENCY, f"get('{role}') waited {elapsed * 1000:.0f} ms on the job board")
+    return skills
+
+
+def wait_for_refreshes(cache, count, timeout=10):
+    deadline = time.monotonic() + timeout
+    while cache.stats()['refreshes'] < count or cache.stats()['in_flight']:
+        check(time.monotonic() < deadline, f"no background refresh after {timeout}s")
+        time.sleep(0.02)
+
+
+def source(cache, role):
+    return cache.cache.get_entry(normalize_role(role))[0]['source']
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), JobBoard)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    skill_gap_analyzer.JOB_BOARD_URL = f'http://127.0.0.1:{server.server_port}/jobs'
+
+    with TemporaryDirectory() as directory:
+        cache = RoleSkillCache(extract_skills_from_job_postings, get_fallback_skills,
+                               path=f'{directory}/role_skills.db', ttl=TTL, retry_interval=0)
+        role = 'Data Scientist'
+
+        # Cold miss
+        check(timed_get(cache, role) == get_fallback_skills(role), "cold miss did not return the fallback skills")
+        wait_for_refreshes(cache, 1)
+        check(JobBoard.queries and 'q=data+scientist' in JobBoard.queries[-1], f"unexpected query {JobBoard.queries}")
+        print("cold miss: fallback served at once, board scraped in the background")
+
+        # Success: fresh profile, no call to the board
+        queries = len(JobBoard.queries)
+        check(timed_get(cache, role) == SCRAPED, f"scraped skills {cache.get(role)} != {SCRAPED}")
+        check(len(JobBoard.queries) == queries and source(cache, role) == 'job_board', "fresh entry was refreshed")
+        print(f"success: scraped profile {SCRAPED} served from the cache")
+
+        # Upstream failure with stale data
+        JobBoard.failing = True
+        time.sleep(TTL)
+        check(timed_get(cache, role) == SCRAPED, "stale entry was not served while refreshing")
+        wait_for_refreshes(cache, 2)
+        check(cache.stats()['refresh_failures'] == 1, f"refresh did not fail: {cache.stats()}")
+        check(timed_get(cache, role) == SCRAPED and source(cache, role) == 'job_board',
+              "failed refresh replaced the stale scraped profile")
+        wait_for_refreshes(cache, 3)
+        print("upstream failure: stale scraped profile kept")
+
+        # Upstream failure with nothing cached
+        other = 'DevOps Engineer'
+        refreshes = cache.stats()['refreshes']
+        check(timed_get(cache, other) == get_fallback_skills(other), "cold miss did not return the fallback skills")
+        wait_for_refreshes(cache, refreshes + 1)
+        check(source(cache, other) == 'fallback', "failed cold refresh did not store the fallback profile")
+        check(timed_get(cache, other) == get_fallback_skills(other), "fallback profile not served")
+        wait_for_refreshes(cache, refreshes + 2)
+
+        # Board back: the fallback profile is replaced by a scraped one
+        JobBoard.failing = False
+        refreshes = cache.stats()['refreshes']
+        timed_get(cache, other)
+        wait_for_refreshes(cache, refreshes + 1)
+        check(source(cache, other) == 'job_board' and cache.get(other) == SCRAPED,
+              "fallback profile was not replaced once the board recovered")
+        print("upstream failure, nothing cached: fallback skills, replaced after recovery")
+        print(f"{len(JobBoard.queries)} board requests, {cache.stats()}")
+
+    server.shutdown()
+    print("ok")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Cached required-skill profiles per job role.
+
+Scraped profiles are kept on disk keyed by the normalized role. Fresh entries
+are served directly; stale ones are served immediately while a background
+thread refreshes them; unknown roles get the fallback skills right away and
+are refreshed in the background. No request ever waits on the job board.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from shared.cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'role_skills.db')
+ROLE_SKILLS_TTL = 6 * 60 * 60  # seconds before a scraped profile is refreshed
+RETRY_INTERVAL = 5 * 60        # seconds between refresh attempts after a failure
+
+
+def normalize_role(job_role: str) -> str:
+    return ' '.join(job_role.lower().split())
+
+
+class RoleSkillCache:
+    def __init__(self, fetch, fallback, path=CACHE_PATH, ttl=ROLE_SKILLS_TTL,
+                 retry_interval=RETRY_INTERVAL, max_items=512):
+        self.fetch = fetch
+        self.fallback = fallback
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.cache = TieredCache(path, max_items=max_items)
+
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='role-refresh')
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._last_failure = {}
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def get(self, job_role: str) -> list:
+        """Required skills for the role, never blocking on the job board"""
+        role = normalize_role(job_role)
+        entry = self.cache.get_entry(role)
+        if entry is None:
+            self._refresh_async(role)
+            return self.fallback(role)
+
+        profile, age = entry
+        if age > self.ttl or profile.get('source') == 'fallback':
+            self._refresh_async(role)
+        return profile['skills']
+
+    def refresh(self, role: str) -> bool:
+        """Scrape the role now; returns False (and keeps what we had) on failure"""
+        role = normalize_role(role)
+        try:
+            skills = self.fetch(role)
+        except Exception as e:
+            logger.warning(f"Refreshing skills for '{role}' failed: {e}")
+            skills = []
+
+        with self._lock:
+            self.refreshes += 1
+        if skills:
+            self.cache.set(role, {'skills': skills, 'source': 'job_board'})
+            return True
+
+        with self._lock:
+            self.refresh_failures += 1
+            self._last_failure[role] = time.monotonic()
+        if self.cache.get_entry(role) is None:
+            self.cache.set(role, {'skills': self.fallback(role), 'source': 'fallback'})
+        return False
+
+    def _refresh_async(self, role):
+        with self._lock:
+            if role in self._in_flight:
+                return
+            failed_at = self._last_failure.get(role)
+            if failed_at is not None and time.monotonic() - failed_at < self.retry_interval:
+                return
+            self._in_flight.add(role)
+
+        def run():
+            try:
+                self.refresh(role)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(role)
+
+        self._executor.submit(run)
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                'refreshes': self.refreshes,
+                'refresh_failures': self.refresh_failures,
+                'in_flight': len(self._in_flight),
+            }
+        stats.update(self.cache.stats())
+        return stats
@@ -0,0 +1,127 @@
+"""Precomputed embedding table for the skill vocabulary.
+
+The build step embeds every known skill once into an L2-normalized float32
+matrix (``skill_embeddings.npy``) plus a name -> row index. At request time
+the matrix is memory-mapped and known skills are plain row lookups; only
+unseen skills go through the transformer, and their vectors are appended to
+an extension file so the next request finds them too.
+
+    python skill_embeddings.py build
+"""
+import json
+import os
+import threading
+
+import numpy as np
+
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_table')
+MATRIX_FILE = 'skill_embeddings.npy'
+INDEX_FILE = 'skill_index.json'
+EXTENSION_FILE = 'skill_extension.jsonl'
+
+
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class SkillEmbeddingTable:
+    """Memory-mapped skill vectors with an append-only extension for new skills"""
+
+    def __init__(self, embed_fn, directory=TABLE_DIR):
+        self.embed_fn = embed_fn
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.transformer_calls = 0
+
+        matrix_path = os.path.join(directory, MATRIX_FILE)
+        index_path = os.path.join(directory, INDEX_FILE)
+        if os.path.exists(matrix_path) and os.path.exists(index_path):
+            self.matrix = np.load(matrix_path, mmap_mode='r')
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        else:
+            self.matrix = None
+            self.index = {}
+
+        # skill -> vector for skills embedded at request time
+        self.extension = {}
+        extension_path = os.path.join(directory, EXTENSION_FILE)
+        if os.path.exists(extension_path):
+            with open(extension_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn write from a crashed process
+                    self.extension[record['skill']] = np.asarray(record['vector'], dtype=np.float32)
+
+    def __contains__(self, skill):
+        return skill in self.index or skill in self.extension
+
+    def lookup(self, skills):
+        """Return normalized vectors for ``skills`` as a (len(skills), dim) array"""
+        unseen = [s for s in dict.fromkeys(skills) if s not in self]
+        if unseen:
+            self._extend(unseen, normalize_rows(self.embed_fn(unseen)))
+
+        rows = []
+        for skill in skills:
+            row = self.index.get(skill)
+            rows.append(self.matrix[row] if row is not None else self.extension[skill])
+        return np.vstack(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+
+    def _extend(self, skills, vectors):
+        lines = ''.join(
+            json.dumps({'skill': skill, 'vector': vector.tolist()}) + '\n'
+            for skill, vector in zip(skills, vectors)
+        )
+        with self._lock:
+            self.transformer_calls += 1
+            for skill, vector in zip(skills, vectors):
+                self.extension[skill] = vector
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, EXTENSION_FILE), 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+    def stats(self):
+        return {
+            'precomputed': len(self.index),
+            'extension': len(self.extension),
+            'transformer_calls': self.transformer_calls,
+        }
+
+
+def build_table(vocabulary, embed_fn, directory=TABLE_DIR, batch_size=64):
+    """Embed the vocabulary and write the matrix and index files"""
+    vocabulary = sorted(set(vocabulary))
+    chunks = [embed_fn(vocabulary[i:i + batch_size]) for i in range(0, len(vocabulary), batch_size)]
+    matrix = normalize_rows(np.vstack(chunks))
+
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, MATRIX_FILE), matrix)
+    with open(os.path.join(directory, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump({skill: row for row, skill in enumerate(vocabulary)}, f)
+
+    # skills now covered by the table no longer need their extension rows
+    extension_path = os.path.join(directory, EXTENSION_FILE)
+    if os.path.exists(extension_path):
+        os.remove(extension_path)
+    return matrix.shape
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        print(__doc__)
+        sys.exit(1)
+
+    from skill_gap_analyzer import get_embeddings, skill_vocabulary
+
+    # unseen skills collected by earlier requests are folded into the new table
+    existing = SkillEmbeddingTable(get_embeddings)
+    vocabulary = set(skill_vocabulary()) | set(existing.extension)
+    shape = build_table(vocabulary, get_embeddings)
+    print(f"Built skill table {shape} in {TABLE_DIR}")
@@ -1,16 +1,29 @@
+import os
+import sys
 import requests
 from bs4 import BeautifulSoup
 from transformers import AutoModel, AutoTokenizer
 import torch
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 import re
 from collections import defaultdict
 import json
+from skill_embeddings import SkillEmbeddingTable
+from skill_matcher import match_skills
 
-# Initialize SBERT model
-tokenizer = AutoTokenizer.from_pretrained('sentence-transformers/all-mpnet-base-v2')
-model = AutoModel.from_pretrained('sentence-transformers/all-mpnet-base-v2')
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.model_registry import models
+from role_skill_cache import RoleSkillCache
+
+# SBERT model, loaded on first use or by the service's warm-up
+SBERT_MODEL = 'sentence-transformers/all-mpnet-base-v2'
+models.register('mpnet_tokenizer', lambda: AutoTokenizer.from_pretrained(SBERT_MODEL))
+models.register('mpnet', lambda: AutoModel.from_pretrained(SBERT_MODEL))
+
+# Job board scraped for required skills; point it at a local stand-in for tests
+JOB_BOARD_URL = "https://www.indeed.com/jobs"
+JOB_BOARD_TIMEOUT = 5  # seconds
 
 # Skill normalization dictionary
 SKILL_NORMALIZATION = {
@@ -32,19 +45,58 @@ SKILL_NORMALIZATION = {
 
 }
 
+# Literal skills the patterns below can produce, plus soft skills; used to
+# build the precomputed embedding table (see skill_embeddings.py)
+TECH_SKILL_TERMS = [
+    'python', 'java', 'c++', 'c#', 'go', 'rust', 'swift', 'kotlin', 'typescript',
+    'scala', 'r', 'ruby', 'php', 'perl', 'haskell', 'elixir', 'erlang',
+    'sql', 'nosql', 'javascript', 'data structures and algorithms', 'html', 'css',
+    'react', 'angular', 'vue', 'svelte',
+    'django', 'flask', 'fastapi', 'node.js', 'nodejs', 'express', 'nestjs', 'spring',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible',
+    'machine learning', 'deep learning', 'data science', 'ai', 'llms',
+    'tensorflow', 'pytorch', 'keras', 'pandas', 'numpy', 'spark', 'hadoop',
+    'git', 'jenkins', 'github actions', 'linux', 'unix', 'bash',
+    'ci/cd', 'tdd', 'agile', 'scrum', 'devops', 'mlops'
+]
+SOFT_SKILL_TERMS = [
+    'communication', 'teamwork', 'leadership', 'problem solving', 'creativity',
+    'adaptability', 'time management', 'critical thinking', 'collaboration',
+    'emotional intelligence', 'negotiation', 'presentation', 'public speaking'
+]
+
 def get_embeddings(texts):
     """Get SBERT embeddings for multiple texts"""
+    tokenizer = models.get('mpnet_tokenizer')
+    model = models.get('mpnet')
     inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True, max_length=128)
     with torch.no_grad():
         outputs = model(**inputs)
-    return outputs.last_hidden_state.mean(dim=1).numpy()
+    # Mean over real tokens only, so a skill's vector does not depend on the
+    # other texts it was padded with
+    mask = inputs['attention_mask'].unsqueeze(-1).float()
+    summed = (outputs.last_hidden_state * mask).sum(dim=1)
+    return (summed / mask.sum(dim=1).clamp(min=1e-9)).numpy()
+
+skill_table = SkillEmbeddingTable(get_embeddings)
+
+def skill_vocabulary():
+    """Every skill name analyze_skill_gap can see without scraping"""
+    vocabulary = set(TECH_SKILL_TERMS) | set(SOFT_SKILL_TERMS)
+    vocabulary |= set(SKILL_NORMALIZATION) | set(SKILL_NORMALIZATION.values())
+    vocabulary |= {SKILL_NORMALIZATION.get(s, s) for s in TECH_SKILL_TERMS}
+    for role in ['data scientist', 'python developer', 'web developer',
+                 'devops engineer', 'software engineer', 'other']:
+        vocabulary |= set(get_fallback_skills(role))
+    return sorted(vocabulary)
 
 def extract_skills_from_job_postings(job_role):
     """Extract skills from multiple job postings"""
     try:
         headers = {'User-Agent': 'Mozilla/5.0'}
-        url = f"https://www.indeed.com/jobs?q={job_role.replace(' ', '+')}&limit=5"
-        response = requests.get(url, headers=headers)
+        url = f"{JOB_BOARD_URL}?q={job_role.replace(' ', '+')}&limit=5"
+        response = requests.get(url, headers=headers, timeout=JOB_BOARD_TIMEOUT)
+        response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
         
         # Extract job descriptions
@@ -122,59 +174,40 @@ def extract_skills_from_resume(resume_text):
     return list(skills)
 
 
-def analyze_skill_gap(job_role, resume_text, similarity_threshold=0.7):
+def analyze_skill_gap(job_role, resume_text, similarity_threshold=0.7, top_k=1):
     """Perform complete skill gap analysis"""
-    # Get required skills
-    required_skills = extract_skills_from_job_postings(job_role)
-    if not required_skills:
-        required_skills = get_fallback_skills(job_role)
+    # Get required skills from the role cache; it refreshes from the job
+    # board in the background and falls back to get_fallback_skills
+    required_skills = role_skill_cache.get(job_role)
     
     # Get candidate skills
     candidate_skills = extract_skills_from_resume(resume_text)
     
-    # Get embeddings for all skills
-    all_skills = list(set(required_skills + candidate_skills))
-    skill_embeddings = get_embeddings(all_skills)
-    skill_to_embedding = {skill: emb for skill, emb in zip(all_skills, skill_embeddings)}
+    # Get embeddings for all skills; only skills missing from the
+    # precomputed table go through the transformer
+    required_vectors = skill_table.lookup(required_skills)
+    candidate_vectors = skill_table.lookup(candidate_skills)
     
-    # Find matches
-    matching_skills = []
-    missing_skills = []
-    
-    for req_skill in required_skills:
-        best_match = None
-        highest_similarity = 0
-        
-        for cand_skill in candidate_skills:
-            similarity = cosine_similarity(
-                [skill_to_embedding[req_skill]],
-                [skill_to_embedding[cand_skill]]
-            )[0][0]
-            
-            if similarity > highest_similarity:
-                highest_similarity = similarity
-                best_match = cand_skill
-        
-        if highest_similarity >= similarity_threshold:
-            matching_skills.append({
-                'required': req_skill,
-                'candidate': best_match,
-                'similarity': highest_similarity
-            })
-        else:
-            missing_skills.append(req_skill)
+    # Find matches with one similarity matrix
+    matches = match_skills(
+        required_skills, candidate_skills, required_vectors, candidate_vectors,
+        similarity_threshold=similarity_threshold, top_k=top_k
+    )
     
     # Calculate match percentage
-    match_percentage = len(matching_skills) / len(required_skills) * 100 if required_skills else 0
+    match_percentage = len(matches['matching_skills']) / len(required_skills) * 100 if required_skills else 0
     
-    return {
+    result = {
         'job_role': job_role,
         'required_skills': required_skills,
         'candidate_skills': candidate_skills,
-        'matching_skills': sorted(matching_skills, key=lambda x: x['similarity'], reverse=True),
-        'missing_skills': missing_skills,
+        'matching_skills': matches['matching_skills'],
+        'missing_skills': matches['missing_skills'],
         'match_percentage': match_percentage
     }
+    if top_k > 1:
+        result['alternatives'] = matches['alternatives']
+    return result
 
 
 def get_fallback_skills(job_role):
@@ -204,3 +237,6 @@ def analyze_soft_skills(text):
         re.IGNORECASE
     )
     return list(set([skill.lower() for skill in re.findall(soft_skill_pattern, text)]))
+
+
+role_skill_cache = RoleSkillCache(extract_skills_from_job_postings, get_fallback_skills)
@@ -0,0 +1,69 @@
+"""Chart drawing for the resume comparison.
+
+Each ``draw_*`` function draws on the Figure it is given (object-oriented
+API only) and is rendered in a worker process by ``shared.rendering``.
+"""
+import numpy as np
+
+
+def draw_radar_chart(fig, data):
+    labels = data['labels']
+    scores1 = data['scores1'] + data['scores1'][:1]
+    scores2 = data['scores2'] + data['scores2'][:1]
+    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
+    angles += angles[:1]
+
+    ax = fig.add_subplot(polar=True)
+    ax.plot(angles, scores1, 'b-', label='Resume 1')
+    ax.fill(angles, scores1, 'b', alpha=0.1)
+    ax.plot(angles, scores2, 'r-', label='Resume 2')
+    ax.fill(angles, scores2, 'r', alpha=0.1)
+
+    ax.set_thetagrids(np.degrees(angles[:-1]), labels)
+    ax.set_title(data['title'])
+    ax.legend()
+
+
+def draw_pie_chart(fig, data):
+    colors = ['#66b3ff', '#ff9999', '#99ff99']
+
+    ax = fig.add_subplot()
+    ax.pie(data['sizes'], labels=data['labels'], colors=colors, autopct='%1.1f%%')
+    ax.set_title("Skill Overlap")
+
+
+def draw_similarity_chart(fig, data):
+    labels = data['labels']
+    x = np.arange(len(labels))
+    width = 0.35
+
+    ax = fig.add_subplot()
+    ax.bar(x - width/2, data['similarity'], width, label='Similarity %', color='skyblue')
+    ax.bar(x + width/2, data['skill_coverage'], width, label='Skill Coverage %', color='lightgreen')
+
+    ax.set_ylabel('Percentage')
+    ax.set_title('Resume vs JD: Similarity & Skill Match')
+    ax.set_xticks(x)
+    if len(labels) > 3:  # leaderboard pages
+        ax.set_xticklabels(labels, rotation=45, ha='right')
+    else:
+        ax.set_xticklabels(labels)
+    ax.legend()
+    fig.tight_layout()
+
+
+def draw_experience_chart(fig, data):
+    skills = data['skills']
+    x = np.arange(len(skills))
+    width = 0.35
+
+    ax = fig.add_subplot()
+    ax.bar(x - width/2, data['resume1'], width, label='Resume 1')
+    ax.bar(x + width/2, data['resume2'], width, label='Resume 2')
+
+    ax.set_ylabel('Years')
+    ax.set_title('Years of Experience by Skill')
+    ax.set_xticks(x)
+    ax.set_xticklabels(skills, rotation=45)
+    ax.legend()
+    fig.tight_layout()
@@ -1,30 +1,51 @@
 from flask import Flask, request, jsonify, render_template
 import os
+import sys
 from werkzeug.utils import secure_filename
-import matplotlib
-matplotlib.use('Agg')
-import base64
-import io
 import re
-import docx
-import PyPDF2
-import spacy
-import matplotlib.pyplot as plt
+import math
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from bs4 import BeautifulSoup
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 from flask_cors import CORS
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from shared.text_extraction import extract_text
+from shared.model_registry import models, install_health_routes
+from shared.rendering import renderer, chart_mode, chart_data
+from shared.images import ImageStore, install_image_routes
+from shared.skills import taxonomy
+from shared.sections import segment, section_name
+from shared.embeddings import MINILM_MODEL, embed_documents, embedding_version, text_key
+from shared.store import get_store
+from charts import draw_radar_chart, draw_pie_chart, draw_similarity_chart, draw_experience_chart
+from jd_registry import JDRegistry
+
 app = Flask(__name__)
 CORS(app)
+install_health_routes(app)
+image_store = ImageStore(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'images'))
+install_image_routes(app, image_store)
 app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
-
-# Load models
-model = SentenceTransformer('all-MiniLM-L6-v2')
-nlp = spacy.load("en_core_web_sm")
+# Room for a ranking batch of a couple of hundred PDFs
+app.config['MAX_CONTENT_LENGTH'] = 64 * 1024 * 1024
+
+MAX_RANK_RESUMES = 500
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+ENCODE_BATCH_SIZE = 32
+EMBED_POOLING = 'mean'  # how resume/JD chunk embeddings are pooled: 'mean' or 'max'
+# Resumes parsed by the resume-parser service already have vectors of this version
+EMBEDDING_VERSION = embedding_version(MINILM_MODEL, EMBED_POOLING)
+MAX_EXTRACT_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+extract_executor = ThreadPoolExecutor(max_workers=MAX_EXTRACT_WORKERS, thread_name_prefix='extract')
+
+# Models are loaded on first use or by the warm-up thread
+models.register('minilm', lambda: SentenceTransformer(MINILM_MODEL))
 
 SKILL_KEYWORDS = {
     "technical": ["python", "sql", "machine learning", "deep learning", "nlp", "pandas", "numpy", "scikit-learn", "tensorflow", "keras"],
@@ -34,34 +55,75 @@ SKILL_KEYWORDS = {
 
 SECTIONS = ["objective", "summary", "skills", "projects", "work experience", "certifications"]
 
-def extract_text_from_pdf(file_path):
-    with open(file_path, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        return ' '.join(page.extract_text() for page in reader.pages if page.extract_text())
-
-def extract_text_from_docx(file_path):
-    doc = docx.Document(file_path)
-    return ' '.join([para.text for para in doc.paragraphs])
+# Skill columns for vectorized coverage: one per SKILL_KEYWORDS entry, plus a
+# skill x group membership matrix
+SKILL_COLUMNS = [(group, skill) for group, skills in SKILL_KEYWORDS.items() for skill in skills]
+SKILL_COLUMN_INDEX = {taxonomy.canonical(skill): i for i, (_, skill) in enumerate(SKILL_COLUMNS)}
+SKILL_GROUP_MATRIX = np.array([[group == name for name in SKILL_KEYWORDS] for group, _ in SKILL_COLUMNS], dtype=np.float64)
 
-def extract_text(file_path):
-    if file_path.endswith('.pdf'):
-        return extract_text_from_pdf(file_path)
-    elif file_path.endswith('.docx'):
-        return extract_text_from_docx(file_path)
-    else:
-        raise ValueError("Unsupported file type. Use PDF or DOCX.")
+def encode_texts(texts):
+    """Unit-length MiniLM embeddings of whole documents (chunked, one batch)"""
+    return embed_documents(models.get('minilm'), list(texts), pooling=EMBED_POOLING, batch_size=ENCODE_BATCH_SIZE)
 
 def compute_similarity(resume_text, jd_text):
-    embeddings = model.encode([resume_text, jd_text])
-    return round(cosine_similarity([embeddings[0]], [embeddings[1]])[0][0] * 100, 2)
+    return compute_similarities([resume_text], jd_text)[0]
+
+def compute_similarities(resume_texts, jd_text=None, jd_embedding=None):
+    """Similarity % of every resume to the JD.
+
+    Resume vectors stored at ingest are loaded; the rest (and the JD, unless
+    given) are encoded in one batch. Only ingested resumes whose stored
+    vectors are of an older version get the new vector written back; ad-hoc
+    uploads are never stored, so the table grows with ingests alone.
+    """
+    store = get_store()
+    keys = [text_key(text) for text in resume_texts]
+    vectors = store.load_embeddings(keys, EMBEDDING_VERSION)
+    missing = [i for i, key in enumerate(keys) if key not in vectors]
+
+    texts = [resume_texts[i] for i in missing]
+    if jd_embedding is None:
+        texts.insert(0, jd_text)
+    encoded = encode_texts(texts) if texts else []
+    if jd_embedding is None:
+        jd_embedding, encoded = encoded[0], encoded[1:]
+    ingested = store.embedded_text_hashes([keys[i] for i in missing]) if missing else set()
+    for i, vector in zip(missing, encoded):
+        vectors[keys[i]] = vector
+        if keys[i] in ingested:
+            store.save_embeddings(keys[i], EMBEDDING_VERSION, {'document': vector})
+    print(f"Resume embeddings: {len(keys) - len(missing)} stored, {len(missing)} encoded, "
+          f"{len(ingested)} refreshed")
+
+    resume_embeddings = np.stack([vectors[key] for key in keys])
+    return np.round(np.asarray(resume_embeddings @ jd_embedding, dtype=np.float64) * 100, 2).tolist()
+
+def skill_matrix(texts):
+    """Boolean (texts x SKILL_COLUMNS) presence matrix"""
+    present = np.zeros((len(texts), len(SKILL_COLUMNS)), dtype=bool)
+    for row, text in zip(present, texts):
+        for skill in taxonomy.skills(text):
+            column = SKILL_COLUMN_INDEX.get(skill)
+            if column is not None:
+                row[column] = True
+    return present
+
+def skill_coverage(resume_skills, jd_skills):
+    """Share of the JD's skills each resume has, per group and overall (in %)"""
+    matched = (resume_skills & jd_skills).astype(np.float64)
+    jd_counts = jd_skills.astype(np.float64) @ SKILL_GROUP_MATRIX
+    per_group = np.divide(matched @ SKILL_GROUP_MATRIX, jd_counts,
+                          out=np.zeros((len(matched), len(SKILL_KEYWORDS))),
+                          where=jd_counts > 0) * 100
+    overall = matched.sum(axis=1) / jd_skills.sum() * 100 if jd_skills.any() else np.zeros(len(matched))
+    return per_group, overall
 
 def extract_skills(text):
-    text = text.lower()
-    return {k: [s for s in v if s in text] for k, v in SKILL_KEYWORDS.items()}
+    return taxonomy.group(taxonomy.skills(text), SKILL_KEYWORDS)
 
 def completeness_score(text):
-    text = text.lower()
-    present_sections = [s for s in SECTIONS if re.search(s, text)]
+    sections = segment(text)
+    present_sections = [s for s in SECTIONS if section_name(s) in sections]
     missing_sections = [s for s in SECTIONS if s not in present_sections]
     score = round(len(present_sections) / len(SECTIONS) * 100, 2)
     return missing_sections, score
@@ -71,80 +133,93 @@ def experience_timeline(text):
     matches = re.findall(pattern, text.lower())
     return [(skill, int(years)) for years, skill in matches]
 
-def generate_radar_chart(scores1, scores2, labels, title):
-    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
-    scores1 += scores1[:1]
-    scores2 += scores2[:1]
-    angles += angles[:1]
+def radar_chart_data(scores1, scores2, labels, title):
+    return {'type': 'radar', 'labels': labels, 'scores1': list(scores1), 'scores2': list(scores2), 'title': title}
 
-    fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(angles, scores1, 'b-', label='Resume 1')
-    ax.fill(angles, scores1, 'b', alpha=0.1)
-    ax.plot(angles, scores2, 'r-', label='Resume 2')
-    ax.fill(angles, scores2, 'r', alpha=0.1)
-
-    ax.set_thetagrids(np.degrees(angles[:-1]), labels)
-    plt.title(title)
-    plt.legend()
-    return fig
-
-def generate_pie_chart(jd_skills, r1_skills, r2_skills):
+def pie_chart_data(jd_skills, r1_skills, r2_skills):
     combined = set(jd_skills)
     r1_only = set(r1_skills) - combined
     r2_only = set(r2_skills) - combined
     overlap = set(r1_skills) & set(r2_skills) & combined
 
-    sizes = [len(r1_only), len(r2_only), len(overlap)]
-    labels = ['R1 Unique', 'R2 Unique', 'Overlap']
-    colors = ['#66b3ff', '#ff9999', '#99ff99']
-    
-    fig, ax = plt.subplots()
-    ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%')
-    plt.title("Skill Overlap")
-    return fig
-
-def generate_similarity_chart(sim1, sim2, coverage1, coverage2):
-    labels = ['Resume 1', 'Resume 2']
-    similarity = [sim1, sim2]
-    skill_cov = [coverage1, coverage2]
-
-    x = np.arange(len(labels))
-    width = 0.35
-
-    fig, ax = plt.subplots()
-    ax.bar(x - width/2, similarity, width, label='Similarity %', color='skyblue')
-    ax.bar(x + width/2, skill_cov, width, label='Skill Coverage %', color='lightgreen')
-
-    ax.set_ylabel('Percentage')
-    ax.set_title('Resume vs JD: Similarity & Skill Match')
-    ax.set_xticks(x)
-    ax.set_xticklabels(labels)
-    ax.legend()
-    plt.tight_layout()
-    return fig
-
-def generate_experience_chart(exps1, exps2):
-    all_skills = list({s for s, _ in exps1 + exps2})
+    return {
+        'type': 'pie',
+        'labels': ['R1 Unique', 'R2 Unique', 'Overlap'],
+        'sizes': [len(r1_only), len(r2_only), len(overlap)]
+    }
+
+def similarity_chart_data(sim1, sim2, coverage1, coverage2):
+    return {
+        'type': 'bar',
+        'labels': ['Resume 1', 'Resume 2'],
+        'similarity': [float(sim1), float(sim2)],
+        'skill_coverage': [float(coverage1), float(coverage2)]
+    }
+
+def experience_chart_data(exps1, exps2):
+    all_skills = sorted({s for s, _ in exps1 + exps2})
     if not all_skills:
         return None
-        
-    r1_vals = [next((y for x, y in exps1 if x == s), 0) for s in all_skills]
-    r2_vals = [next((y for x, y in exps2 if x == s), 0) for s in all_skills]
-
-    x = np.arange(len(all_skills))
-    width = 0.35
-    
-    fig, ax = plt.subplots()
-    ax.bar(x - width/2, r1_vals, width, label='Resume 1')
-    ax.bar(x + width/2, r2_vals, width, label='Resume 2')
-
-    ax.set_ylabel('Years')
-    ax.set_title('Years of Experience by Skill')
-    ax.set_xticks(x)
-    ax.set_xticklabels(all_skills, rotation=45)
-    ax.legend()
-    plt.tight_layout()
-    return fig
+
+    return {
+        'type': 'bar',
+        'skills': all_skills,
+        'resume1': [next((y for x, y in exps1 if x == s), 0) for s in all_skills],
+        'resume2': [next((y for x, y in exps2 if x == s), 0) for s in all_skills]
+    }
+
+def prepare_jd(jd_text):
+    """All JD-side work of a compare/rank request, done once per registered JD"""
+    return {
+        'embedding': encode_texts([jd_text])[0],
+        'skills': extract_skills(jd_text),
+        'skill_vector': skill_matrix([jd_text])[0]
+    }
+
+jd_registry = JDRegistry(prepare_jd)
+
+def resolve_jd():
+    """(jd_text, registered JD or None) for a compare/rank request"""
+    jd_id = request.values.get('jd_id')
+    if jd_id:
+        jd = jd_registry.get(jd_id)
+        if jd is None:
+            raise LookupError(f"Unknown or expired jd_id: {jd_id}")
+        print(f"Using registered job description {jd_id}")
+        return jd['text'], jd
+
+    jd_text = request.form.get('job_description', '')
+    linkedin_url = request.form.get('linkedin_url', '')
+    print(f"Received job description length: {len(jd_text)}")
+    if linkedin_url:
+        linkedin_text = scrape_linkedin_profile(linkedin_url)
+        print(f"Scraped LinkedIn profile content (length: {len(linkedin_text)})")
+        jd_text += linkedin_text
+    return jd_text, None
+
+def leaderboard_chart_data(entries):
+    return {
+        'type': 'bar',
+        'labels': [entry['filename'] for entry in entries],
+        'similarity': [entry['similarity'] for entry in entries],
+        'skill_coverage': [entry['skill_coverage'] for entry in entries]
+    }
+
+def extract_uploads(files):
+    """Extract every upload on the extraction pool: ([(filename, text)], [errors])"""
+    uploads = [(file.filename, file.read()) for file in files]
+    futures = [extract_executor.submit(extract_text, data, filename=secure_filename(filename))
+               for filename, data in uploads]
+    extracted, errors = [], []
+    for (filename, _), future in zip(uploads, futures):
+        try:
+            text = future.result()
+            if not text.strip():
+                raise ValueError("No text could be extracted")
+            extracted.append((filename, text))
+        except Exception as e:
+            errors.append({'filename': filename, 'error': str(e)})
+    return extracted, errors
 
 def scrape_linkedin_profile(url):
     headers = {'User-Agent': 'Mozilla/5.0'}
@@ -154,13 +229,10 @@ def scrape_linkedin_profile(url):
     soup = BeautifulSoup(response.text, 'html.parser')
     return soup.get_text(separator=' ')
 
-def fig_to_base64(fig):
-    buf = io.BytesIO()
-    fig.savefig(buf, format='png', bbox_inches='tight')
-    plt.close(fig)
-    return base64.b64encode(buf.getbuffer()).decode('ascii')
-
-# ... [imports remain unchanged] ...
+def render_charts(jobs):
+    """Render {name: (draw, data, options)} in the chart worker pool, returning image URLs"""
+    pngs = renderer.render_many(jobs)
+    return {name: f'/api/images/{image_store.put_content(png)}' for name, png in pngs.items()}
 
 @app.route('/api/compare', methods=['POST'])
 def compare_resumes_api():
@@ -173,39 +245,26 @@ def compare_resumes_api():
             
         resume1 = request.files['resume1']
         resume2 = request.files['resume2']
-        jd_text = request.form.get('job_description', '')
-        linkedin_url = request.form.get('linkedin_url', '')
-
         print(f"Received resumes: {resume1.filename}, {resume2.filename}")
-        print(f"Received job description length: {len(jd_text)}")
-        print(f"LinkedIn URL: {linkedin_url}")
-
-        # Save files
-        resume1_path = os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(resume1.filename))
-        resume2_path = os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(resume2.filename))
-        resume1.save(resume1_path)
-        resume2.save(resume2_path)
-        print("Saved resume files locally.")
-
-        # Extract text
-        r1_text = extract_text(resume1_path)
-        r2_text = extract_text(resume2_path)
+        try:
+            jd_text, jd = resolve_jd()
+        except LookupError as e:
+            return jsonify({'error': str(e)}), 404
+
+        # Extract text in memory
+        r1_text = extract_text(resume1.stream, filename=secure_filename(resume1.filename))
+        r2_text = extract_text(resume2.stream, filename=secure_filename(resume2.filename))
         print("Extracted text from resumes.")
 
-        if linkedin_url:
-            linkedin_text = scrape_linkedin_profile(linkedin_url)
-            print(f"Scraped LinkedIn profile content (length: {len(linkedin_text)})")
-            jd_text += linkedin_text
-
-        # Similarity
-        sim1 = compute_similarity(r1_text, jd_text)
-        sim2 = compute_similarity(r2_text, jd_text)
+        # Similarity (both resumes, and the JD unless registered, in one encode)
+        sim1, sim2 = compute_similarities([r1_text, r2_text], jd_text,
+                                          jd_embedding=jd['embedding'] if jd else None)
         print(f"Similarity computed: Resume 1 -> {sim1}%, Resume 2 -> {sim2}%")
 
         # Skills
         r1_skills = extract_skills(r1_text)
         r2_skills = extract_skills(r2_text)
-        jd_skills = extract_skills(jd_text)
+        jd_skills = jd['skills'] if jd else extract_skills(jd_text)
         print("Extracted skills from resumes and job description.")
 
         r1_flat = [s for v in r1_skills.values() for s in v]
@@ -230,26 +289,25 @@ def compare_resumes_api():
         print(f"Experience timelines extracted. Resume 1: {exp1}, Resume 2: {exp2}")
 
         # Generate charts
-        charts = {}
-        charts['radar'] = fig_to_base64(generate_radar_chart(
-            scores1, scores2, list(SKILL_KEYWORDS.keys()), "Skill Match Radar"
-        ))
-        print("Generated radar chart.")
-
-        charts['pie'] = fig_to_base64(generate_pie_chart(jd_flat, r1_flat, r2_flat))
-        print("Generated pie chart.")
-
-        charts['similarity'] = fig_to_base64(generate_similarity_chart(
-            sim1, sim2, np.mean(list(coverage1.values())), np.mean(list(coverage2.values()))
-        ))
-        print("Generated similarity comparison chart.")
-
-        exp_chart = generate_experience_chart(exp1, exp2)
-        if exp_chart:
-            charts['experience'] = fig_to_base64(exp_chart)
-            print("Generated experience chart.")
+        jobs = {
+            'radar': (draw_radar_chart, radar_chart_data(
+                scores1, scores2, list(SKILL_KEYWORDS.keys()), "Skill Match Radar"
+            ), {'figsize': (6, 6)}),
+            'pie': (draw_pie_chart, pie_chart_data(jd_flat, r1_flat, r2_flat), {}),
+            'similarity': (draw_similarity_chart, similarity_chart_data(
+                sim1, sim2, np.mean(list(coverage1.values())), np.mean(list(coverage2.values()))
+            ), {})
+        }
+        exp_data = experience_chart_data(exp1, exp2)
+        if exp_data:
+            jobs['experience'] = (draw_experience_chart, exp_data, {})
         else:
             print("No valid experience data to generate chart.")
+        if chart_mode(request) == 'data':
+            charts = {'chart_data': chart_data(jobs)}
+        else:
+            charts = {'charts': render_charts(jobs)}
+            print(f"Generated charts: {list(charts['charts'])}")
 
         result = {
             "Resume 1": {
@@ -270,22 +328,139 @@ def compare_resumes_api():
         print("Returning final JSON response.")
         return jsonify({
             'result': result,
-            'charts': charts
+            **charts
         })
 
     except Exception as e:
         print(f"Error occurred: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-    finally:
-        # Clean up
-        if 'resume1_path' in locals() and os.path.exists(resume1_path):
-            os.remove(resume1_path)
-            print("Cleaned up resume1 file.")
-        if 'resume2_path' in locals() and os.path.exists(resume2_path):
-            os.remove(resume2_path)
-            print("Cleaned up resume2 file.")
+@app.route('/api/rank', methods=['POST'])
+def rank_resumes_api():
+    """Rank many resumes against one JD as a sorted, paginated leaderboard"""
+    try:
+        files = [f for f in request.files.getlist('resumes') if f.filename]
+        if not files:
+            return jsonify({'error': 'No resumes uploaded (send them as "resumes")'}), 400
+        if len(files) > MAX_RANK_RESUMES:
+            return jsonify({'error': f'At most {MAX_RANK_RESUMES} resumes per request'}), 400
+
+        sort_key = request.values.get('sort', 'similarity')
+        if sort_key not in ('similarity', 'skill_coverage', 'completeness'):
+            return jsonify({'error': 'sort must be similarity, skill_coverage or completeness'}), 400
+        try:
+            page = max(1, int(request.values.get('page', 1)))
+            page_size = min(MAX_PAGE_SIZE, max(1, int(request.values.get('page_size', DEFAULT_PAGE_SIZE))))
+        except ValueError:
+            return jsonify({'error': 'page and page_size must be integers'}), 400
+
+        try:
+            jd_text, jd = resolve_jd()
+        except LookupError as e:
+            return jsonify({'error': str(e)}), 404
+        if not jd_text.strip():
+            return jsonify({'error': 'Missing job description'}), 400
+
+        extracted, errors = extract_uploads(files)
+        print(f"Ranking {len(extracted)} resumes ({len(errors)} failed extraction)")
+        if not extracted:
+            return jsonify({'error': 'No resume text could be extracted', 'errors': errors}), 400
+        texts = [text for _, text in extracted]
+
+        similarities = compute_similarities(texts, jd_text, jd_embedding=jd['embedding'] if jd else None)
+        jd_skills = jd['skill_vector'] if jd else skill_matrix([jd_text])[0]
+        resume_skills = skill_matrix(texts)
+        per_group, overall = skill_coverage(resume_skills, jd_skills)
+
+        entries = []
+        for i, (filename, text) in enumerate(extracted):
+            missing, completeness = completeness_score(text)
+            entries.append({
+                'filename': filename,
+                'similarity': similarities[i],
+                'skill_coverage': round(float(overall[i]), 2),
+                'coverage_by_group': dict(zip(SKILL_KEYWORDS, np.round(per_group[i], 2).tolist())),
+                'matched_skills': [SKILL_COLUMNS[c][1] for c in np.flatnonzero(resume_skills[i] & jd_skills)],
+                'missing_skills': [SKILL_COLUMNS[c][1] for c in np.flatnonzero(jd_skills & ~resume_skills[i])],
+                'completeness': completeness,
+                'missing_sections': missing
+            })
+        entries.sort(key=lambda entry: (entry[sort_key], entry['similarity']), reverse=True)
+        for rank, entry in enumerate(entries, start=1):
+            entry['rank'] = rank
+
+        start = (page - 1) * page_size
+        page_entries = entries[start:start + page_size]
+        response = {
+            'leaderboard': page_entries,
+            'page': page,
+            'page_size': page_size,
+            'total': len(entries),
+            'pages': math.ceil(len(entries) / page_size),
+            'sort': sort_key,
+            'jd_id': jd['id'] if jd else None,
+            'errors': errors
+        }
+
+        # Charts are opt-in here: ?charts=png or ?charts=data, for the current page
+        if request.values.get('charts') and page_entries:
+            jobs = {'leaderboard': (draw_similarity_chart, leaderboard_chart_data(page_entries),
+                                    {'figsize': (max(6.4, 0.6 * len(page_entries)), 4.8)})}
+            if chart_mode(request) == 'data':
+                response['chart_data'] = chart_data(jobs)
+            else:
+                response['charts'] = render_charts(jobs)
+
+        return jsonify(response)
+
+    except Exception as e:
+        print(f"Error occurred: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jd', methods=['POST'])
+def register_jd_api():
+    """Parse and embed a job description once; compare/rank can then pass its jd_id"""
+    data = request.get_json(silent=True) if request.is_json else request.form
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Send the job description as a JSON object or form fields'}), 400
+    jd_text = data.get('job_description', '')
+    linkedin_url = data.get('linkedin_url', '')
+    if not isinstance(jd_text, str) or not isinstance(linkedin_url, str):
+        return jsonify({'error': 'job_description and linkedin_url must be strings'}), 400
+    if not jd_text.strip() and not linkedin_url:
+        return jsonify({'error': 'Missing job description'}), 400
+
+    try:
+        jd, created = jd_registry.register(
+            jd_text, linkedin_url,
+            resolve_text=lambda: jd_text + (scrape_linkedin_profile(linkedin_url) if linkedin_url else '')
+        )
+    except Exception as e:
+        print(f"Error occurred: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+    return jsonify({
+        'jd_id': jd['id'],
+        'hash': jd['hash'],
+        'skills': jd['skills'],
+        'length': len(jd['text']),
+        'deduplicated': not created
+    }), 201 if created else 200
+
+@app.route('/api/jd/<jd_id>', methods=['GET'])
+def get_jd_api(jd_id):
+    jd = jd_registry.get(jd_id)
+    if jd is None:
+        return jsonify({'error': f"Unknown or expired jd_id: {jd_id}"}), 404
+    return jsonify({key: jd[key] for key in ('id', 'hash', 'text', 'skills', 'created_at')}), 200
+
+@app.route('/api/compare/stats', methods=['GET'])
+def compare_stats():
+    return jsonify({'charts': renderer.stats(), 'images': image_store.stats(), 'jds': jd_registry.stats()}), 200
 
 if __name__ == '__main__':
+    models.warm_up()
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     app.run(debug=True, port=5004)
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""Registered job descriptions, parsed and embedded once.
+
+A JD is registered with its text (and optional LinkedIn URL, scraped at
+registration). The service's ``prepare`` callable runs the JD-side work once
+-- embedding, skill extraction -- and compare/rank requests then reference
+it by id. Ids are derived from the submitted content, so registering the
+same JD again returns the existing entry without redoing any work. Entries
+live in memory in LRU order and the least recently used are evicted past
+``max_items``.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+MAX_JDS = 256
+
+
+def normalize_jd(text: str) -> str:
+    return ' '.join(text.split())
+
+
+def jd_key(text: str, linkedin_url: str = '') -> str:
+    """Content hash of a submission (whitespace-insensitive)"""
+    return hashlib.sha256(f"{normalize_jd(text)}\n{linkedin_url.strip()}".encode('utf-8')).hexdigest()
+
+
+class JDRegistry:
+    def __init__(self, prepare, max_items=MAX_JDS):
+        self.prepare = prepare
+        self.max_items = max_items
+        self._entries = OrderedDict()  # id -> entry, least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.registered = 0
+        self.deduplicated = 0
+        self.evicted = 0
+
+    def register(self, text: str, linkedin_url: str = '', resolve_text=None):
+        """(entry, created) for a JD; ``resolve_text`` builds the full text on first sight"""
+        content_hash = jd_key(text, linkedin_url)
+        jd_id = content_hash[:16]
+        with self._lock:
+            entry = self._entries.get(jd_id)
+            if entry is not None:
+                self._entries.move_to_end(jd_id)
+                self.deduplicated += 1
+                return entry, False
+
+        full_text = resolve_text() if resolve_text else text
+        entry = {
+            'id': jd_id,
+            'hash': content_hash,
+            'text': full_text,
+            'created_at': time.time(),
+            **self.prepare(full_text)
+        }
+        with self._lock:
+            existing = self._entries.get(jd_id)
+            if existing is not None:  # registered concurrently
+                self._entries.move_to_end(jd_id)
+                return existing, False
+            self._entries[jd_id] = entry
+            self.registered += 1
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+        return entry, True
+
+    def get(self, jd_id: str):
+        with self._lock:
+            entry = self._entries.get(jd_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(jd_id)
+            self.hits += 1
+            return entry
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_items': self.max_items,
+                'registered': self.registered,
+                'deduplicated': self.deduplicated,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evicted': self.evicted,
+            }
@@ -2,9 +2,7 @@
 
 import os
 import re
-import docx
-import PyPDF2
-import spacy
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 import requests
@@ -12,9 +10,14 @@ from bs4 import BeautifulSoup
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.text_extraction import extract_text
+from shared.skills import taxonomy
+from shared.sections import segment, section_name
+
 # Load models
 model = SentenceTransformer('all-MiniLM-L6-v2')
-nlp = spacy.load("en_core_web_sm")
 
 SKILL_KEYWORDS = {
     "technical": ["python", "sql", "machine learning", "deep learning", "nlp", "pandas", "numpy", "scikit-learn", "tensorflow", "keras"],
@@ -24,34 +27,16 @@ SKILL_KEYWORDS = {
 
 SECTIONS = ["objective", "summary", "skills", "projects", "work experience", "certifications"]
 
-def extract_text_from_pdf(file_path):
-    with open(file_path, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        return ' '.join(page.extract_text() for page in reader.pages if page.extract_text())
-
-def extract_text_from_docx(file_path):
-    doc = docx.Document(file_path)
-    return ' '.join([para.text for para in doc.paragraphs])
-
-def extract_text(file_path):
-    if file_path.endswith('.pdf'):
-        return extract_text_from_pdf(file_path)
-    elif file_path.endswith('.docx'):
-        return extract_text_from_docx(file_path)
-    else:
-        raise ValueError("Unsupported file type. Use PDF or DOCX.")
-
 def compute_similarity(resume_text, jd_text):
     embeddings = model.encode([resume_text, jd_text])
     return round(cosine_similarity([embeddings[0]], [embeddings[1]])[0][0] * 100, 2)
 
 def extract_skills(text):
-    text = text.lower()
-    return {k: [s for s in v if s in text] for k, v in SKILL_KEYWORDS.items()}
+    return taxonomy.group(taxonomy.skills(text), SKILL_KEYWORDS)
 
 def completeness_score(text):
-    text = text.lower()
-    present_sections = [s for s in SECTIONS if re.search(s, text)]
+    sections = segment(text)
+    present_sections = [s for s in SECTIONS if section_name(s) in sections]
     missing_sections = [s for s in SECTIONS if s not in present_sections]
     score = round(len(present_sections) / len(SECTIONS) * 100, 2)
     return missing_sections, score
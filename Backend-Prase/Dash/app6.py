@@ -1,43 +1,54 @@
 import os
+import sys
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import base64
-from io import BytesIO
-import fitz  # PyMuPDF
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from shared.text_extraction import extract_text
+from shared.model_registry import install_health_routes
 from parser import parse_resume, compute_skill_percentages, SKILL_CATEGORIES
-from visualizer import show_skill_chart, show_experience_chart, show_certification_chart
+from shared.rendering import renderer, chart_mode, chart_data
+from shared.images import ImageStore, install_image_routes
+from charts import (
+    skill_chart_data, experience_chart_data, certification_chart_data,
+    draw_skill_chart, draw_experience_chart, draw_certification_chart
+)
 
 app = Flask(__name__)
 CORS(app)
+install_health_routes(app)
+image_store = ImageStore(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'images'))
+install_image_routes(app, image_store)
 
-def generate_chart_image(chart_function, data):
-    """Helper function to generate base64 encoded chart images"""
-    import matplotlib.pyplot as plt
-    buf = BytesIO()
-    fig = plt.figure()
-    chart_function(data)
-    fig.savefig(buf, format='png', bbox_inches='tight')
-    plt.close(fig)
-    return base64.b64encode(buf.getvalue()).decode('utf-8')
+def build_chart_jobs(parsed_data, skill_percentages):
+    """Dashboard chart series as {name: (draw, data, render options)}"""
+    return {
+        'skills': (draw_skill_chart, skill_chart_data(skill_percentages), {}),
+        'experience': (draw_experience_chart, experience_chart_data(parsed_data.get('experience', [])), {}),
+        'certifications': (draw_certification_chart, certification_chart_data(parsed_data.get('certifications', [])), {})
+    }
+
+def generate_chart_images(chart_jobs):
+    """Render the dashboard charts in the worker pool, returning image URLs"""
+    pngs = renderer.render_many(chart_jobs)
+    return {name: f'/api/images/{image_store.put_content(png)}' for name, png in pngs.items()}
 
 def extract_text_from_pdf(file_stream):
     """Extracts text from a PDF file stream"""
-    text = ""
     try:
-        # Rewind the stream to beginning
-        file_stream.seek(0)
-        
-        with fitz.open(stream=file_stream.read(), filetype="pdf") as doc:
-            for page in doc:
-                text += page.get_text()
+        return extract_text(file_stream, filename="resume.pdf", sep="")
     except Exception as e:
         print(f"Error during PDF extraction: {e}")
         raise e
-    return text
 
 
-def process_resume_text(text):
-    """Processes resume text and generates analysis results"""
+def process_resume_text(text, charts_mode='png'):
+    """Processes resume text and generates analysis results
+
+    With ``charts_mode='data'`` the chart series are returned instead of images.
+    """
     try:
         # Parse the resume text
         parsed_data = parse_resume(text)
@@ -57,11 +68,11 @@ def process_resume_text(text):
         )
         
         # Generate charts
-        charts = {
-            'skills': generate_chart_image(show_skill_chart, skill_percentages),
-            'experience': generate_chart_image(show_experience_chart, parsed_data.get('experience', [])),
-            'certifications': generate_chart_image(show_certification_chart, parsed_data.get('certifications', []))
-        }
+        chart_jobs = build_chart_jobs(parsed_data, skill_percentages)
+        if charts_mode == 'data':
+            charts = {'chart_data': chart_data(chart_jobs)}
+        else:
+            charts = {'charts': generate_chart_images(chart_jobs)}
         
         return {
             'profile': parsed_data.get('profile', {}),
@@ -70,11 +81,7 @@ def process_resume_text(text):
             'experience': parsed_data.get('experience', []),
             'certifications': parsed_data.get('certifications', []),
             'projects': parsed_data.get('projects', []),
-            'charts': {
-                    'skills': generate_chart_image(show_skill_chart, skill_percentages),
-                    'experience': generate_chart_image(show_experience_chart, parsed_data.get('experience', [])),
-                     'certifications': generate_chart_image(show_certification_chart, parsed_data.get('certifications', []))
-              },
+            **charts,
              'skill_percentages': skill_percentages
 
         }
@@ -96,10 +103,7 @@ def handle_parse_resume():
             if not file.filename.lower().endswith('.pdf'):
                 return jsonify({"error": "File must be a PDF"}), 400
                 
-            # Create in-memory file stream
-            file_stream = BytesIO()
-            file.save(file_stream)
-            text = extract_text_from_pdf(file_stream)
+            text = extract_text_from_pdf(file.stream)
             
         elif 'text' in request.form:
             # Handle plain text input
@@ -110,13 +114,17 @@ def handle_parse_resume():
             return jsonify({"error": "No resume data provided"}), 400
         
         # Process the extracted text
-        result = process_resume_text(text)
+        result = process_resume_text(text, charts_mode=chart_mode(request))
         return jsonify(result), 200
         
     except Exception as e:
         print(f"Error in resume parsing: {str(e)}")
         return jsonify({"error": "Failed to process resume", "details": str(e)}), 500
 
+@app.route('/api/parse-resume/stats', methods=['GET'])
+def parse_resume_stats():
+    return jsonify({'charts': renderer.stats(), 'images': image_store.stats()}), 200
+
 if __name__ == '__main__':
     os.makedirs('uploads', exist_ok=True)
     app.run(host='0.0.0.0', port=5007, debug=True)
\ No newline at end of file
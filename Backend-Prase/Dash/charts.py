@@ -0,0 +1,56 @@
+"""Chart drawing for the resume dashboard.
+
+Object-oriented counterparts of the Streamlit charts in visualizer.py. Each
+``draw_*`` function draws on the Figure it is given and is rendered in a
+worker process by ``shared.rendering``; the counting happens in the
+``*_chart_data`` builders so only small dicts cross the process boundary.
+"""
+from collections import Counter
+
+
+def skill_chart_data(skill_percentages):
+    return {'type': 'bar', 'labels': list(skill_percentages.keys()), 'values': list(skill_percentages.values())}
+
+
+def experience_chart_data(experience):
+    domain_counts = Counter(["Software" if "developer" in e.lower() else "Other" for e in experience])
+    return {'type': 'pie', 'labels': list(domain_counts.keys()), 'sizes': list(domain_counts.values())}
+
+
+def certification_chart_data(certifications):
+    categories = Counter(["Technical" if any(kw in c.lower() for kw in ["python", "ml", "ai", "data"]) else "General"
+                          for c in certifications])
+    return {'type': 'pie', 'labels': list(categories.keys()), 'sizes': list(categories.values())}
+
+
+def _draw_empty(ax, message):
+    ax.text(0.5, 0.5, message, ha='center', va='center', fontsize=12, color='grey')
+    ax.set_axis_off()
+
+
+def draw_skill_chart(fig, data):
+    ax = fig.add_subplot()
+    if not data['labels']:
+        _draw_empty(ax, "No skills detected.")
+        return
+    ax.barh(data['labels'], data['values'], color='skyblue')
+    ax.set_xlabel("Count")
+    ax.set_title("Skill Distribution")
+
+
+def draw_experience_chart(fig, data):
+    ax = fig.add_subplot()
+    if not data['labels']:
+        _draw_empty(ax, "No experience data found.")
+        return
+    ax.pie(data['sizes'], labels=data['labels'], autopct='%1.1f%%')
+    ax.set_title("Experience Domains")
+
+
+def draw_certification_chart(fig, data):
+    ax = fig.add_subplot()
+    if not data['labels']:
+        _draw_empty(ax, "No certifications found.")
+        return
+    ax.pie(data['sizes'], labels=data['labels'], autopct='%1.1f%%')
+    ax.set_title("Certification Categories")
@@ -1,11 +1,9 @@
 # parser.py
 
 import re
-from io import BytesIO
-from pdfminer.high_level import extract_text
-import spacy
-
-nlp = spacy.load("en_core_web_sm")
+from shared.text_extraction import extract_text
+from shared.skills import taxonomy
+from shared.sections import segment, section_name
 
 SKILL_CATEGORIES = {
     "Front-End Development": ["HTML", "CSS", "JavaScript", "React", "Bootstrap", "Tailwind"],
@@ -17,7 +15,7 @@ SKILL_CATEGORIES = {
 }
 
 def extract_text_from_pdf(uploaded_file):
-    return extract_text(BytesIO(uploaded_file.read()))
+    return extract_text(uploaded_file, filename="resume.pdf")
 
 def extract_contact_info(text):
     if isinstance(text, tuple):  # added check
@@ -40,25 +38,22 @@ def extract_contact_info(text):
 def extract_skills(text):
     skill_keywords = ['python', 'java', 'c++', 'html', 'css', 'javascript', 'react', 'node', 'machine learning',
                       'nlp', 'sql', 'mongodb', 'git', 'docker', 'aws', 'tensorflow', 'pytorch']
-    skills_found = [kw.title() for kw in skill_keywords if re.search(r'\b' + kw + r'\b', text, re.IGNORECASE)]
+    found = set(taxonomy.skills(text))
+    skills_found = [kw.title() for kw in skill_keywords if taxonomy.canonical(kw) in found]
     return skills_found
 
 def extract_sections(text, keyword):
-    pattern = rf'{keyword}\s*:?[\n\-•]*([\s\S]*?)(\n\n|$)'
-    result = re.findall(pattern, text, re.IGNORECASE)
-    return [line.strip("•- ") for block in result for line in block[0].split("\n") if line.strip()] if result else []
+    return segment(text).lines(section_name(keyword))
 
 def compute_skill_percentages(resume_text, skill_categories):
-    text = resume_text.lower()
+    # Accepts the resume text or an already extracted list of skills
+    if not isinstance(resume_text, str):
+        resume_text = "\n".join(resume_text)
+    found = taxonomy.group(taxonomy.skills(resume_text), skill_categories)
     category_percentages = {}
 
     for category, subskills in skill_categories.items():
-        found = 0
-        for skill in subskills:
-            # Simple presence check (case-insensitive)
-            if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text):
-                found += 1
-        percentage = int((found / len(subskills)) * 100) if subskills else 0
+        percentage = int((len(found[category]) / len(subskills)) * 100) if subskills else 0
         category_percentages[category] = percentage
 
     return category_percentages
@@ -0,0 +1,103 @@
+"""Benchmark recommendation fetching against local stand-in APIs.
+
+Starts two local HTTP servers that answer like Coursera and GitHub after an
+artificial delay, points main3 at them and compares the old sequential loop
+(which also called Coursera twice per skill) with fetch_recommendations.
+Each fan-out run gets its own empty recommendation cache in a temporary
+directory, so runs are repeatable and the service's cache never sees the
+stand-in results.
+
+    python bench_fanout.py [latency_ms] [skills]
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import main3
+from shared.cache import TieredCache
+
+
+def stand_in_server(payload, latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, like the real APIs
+        requests_served = 0
+
+        def do_GET(self):
+            Handler.requests_served += 1
+            time.sleep(latency)
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, Handler
+
+
+def sequential(skills):
+    """The loop /api/learn used before the fan-out"""
+    recommendations = []
+    for skill in skills:
+        recommendations.extend(main3.fetch_coursera_courses(skill))
+        recommendations.extend(main3.fetch_github_projects(skill))
+        main3.fetch_coursera_courses(skill)  # the debug print call
+    return recommendations
+
+
+def use_empty_cache(directory, name):
+    """Point main3 at a new, empty recommendation cache under ``directory``"""
+    main3.recommendation_cache = TieredCache(
+        os.path.join(directory, f'{name}.db'), max_items=512, ttl=main3.RECOMMENDATION_CACHE_TTL)
+
+
+def main(latency_ms=300, n_skills=3):
+    service_cache = main3.recommendation_cache
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            run(latency_ms, n_skills, directory)
+    finally:
+        main3.recommendation_cache = service_cache
+
+
+def run(latency_ms, n_skills, directory):
+    latency = latency_ms / 1000
+    coursera, coursera_handler = stand_in_server(
+        {'elements': [{'name': 'Course', 'slug': 'course', 'primaryLanguages': ['en']}] * 3}, latency)
+    github, github_handler = stand_in_server(
+        {'items': [{'name': 'Project', 'html_url': 'https://github.com/x/y'}] * 3}, latency)
+    main3.COURSERA_API_URL = f'http://127.0.0.1:{coursera.server_port}/courses'
+    main3.GITHUB_API_URL = f'http://127.0.0.1:{github.server_port}/search'
+
+    skills = [f'skill{i}' for i in range(n_skills)]
+    use_empty_cache(directory, 'fan-out')
+    for name, fetch in (('sequential', lambda: sequential(skills)),
+                        ('fan-out', lambda: main3.fetch_recommendations(skills)[0]),
+                        ('cached', lambda: main3.fetch_recommendations(skills)[0])):
+        before = coursera_handler.requests_served + github_handler.requests_served
+        start = time.perf_counter()
+        results = fetch()
+        elapsed = time.perf_counter() - start
+        calls = coursera_handler.requests_served + github_handler.requests_served - before
+        print(f"{name:>10}: {elapsed * 1000:8.1f} ms  {calls} upstream calls  {len(results)} recommendations")
+
+    use_empty_cache(directory, 'deadline')
+    results, timed_out = main3.fetch_recommendations(skills, deadline=latency / 2)
+    print(f"  deadline: {len(results)} recommendations, {len(timed_out)} calls dropped at {latency_ms / 2:.0f} ms")
+    # Dropped calls still finish and cache their results; let them, while
+    # the temporary cache is the one installed
+    main3.fetch_executor.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
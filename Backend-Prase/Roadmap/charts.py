@@ -0,0 +1,42 @@
+"""Chart drawing for the learning roadmap.
+
+Each ``draw_*`` function draws on the Figure it is given (object-oriented
+API only) and is rendered in a worker process by ``shared.rendering``.
+"""
+from math import pi
+
+
+def draw_skill_match_gauge(fig, data):
+    """Horizontal bar showing the overall match percentage"""
+    ax = fig.add_subplot()
+    match_percentage = data['match_percentage']
+    ax.barh([0], [match_percentage],
+            color=['green' if match_percentage >= 70
+                   else 'yellow' if match_percentage >= 40
+                   else 'red'])
+    ax.set_xlim(0, 100)
+    ax.set_yticks([])
+    ax.set_xlabel('Skill Match Percentage')
+    ax.set_title('Skill Match Percentage', pad=20)
+    ax.text(match_percentage, 0, f'{match_percentage:.1f}%',
+            ha='center', va='center', color='black', fontweight='bold')
+
+
+def draw_skill_radar(fig, data):
+    """Percentage of required skills matched in each skill category"""
+    categories = data['categories']
+    percentages = data['percentages']
+    N = len(categories)
+    angles = [n / float(N) * 2 * pi for n in range(N)] + [0]
+    values = percentages + percentages[:1]
+
+    ax = fig.add_subplot(111, polar=True)
+    ax.plot(angles, values, linewidth=2, linestyle='solid',
+            color='#1f77b4', marker='o', markersize=8)
+    ax.fill(angles, values, '#1f77b4', alpha=0.25)
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(categories, size=12)
+    ax.set_rlabel_position(30)
+    ax.set_yticks([20, 40, 60, 80], ["20%", "40%", "60%", "80%"], color="grey", size=10)
+    ax.set_ylim(0, 100)
+    ax.set_title('Skill Match by Category', size=14, pad=20)
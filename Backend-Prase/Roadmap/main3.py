@@ -1,67 +1,121 @@
 import os
-import json
+import sys
 import requests
-import base64
-from io import BytesIO
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from urllib.parse import quote_plus
-import matplotlib
-matplotlib.use('Agg')  # Set the backend to Agg
-import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
-from math import pi
 import seaborn as sns
 from flask import request, jsonify
 from datetime import datetime
 import uuid
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.store import get_store
+from shared.cache import TieredCache
+from shared.rendering import renderer, chart_mode, chart_data
+from shared.images import ImageStore, install_image_routes
+from shared.skills import taxonomy
+from charts import draw_skill_match_gauge, draw_skill_radar
+from shared.model_registry import install_health_routes
 
 app = Flask(__name__)
 CORS(app)
+install_health_routes(app)
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PARSED_DATA_FOLDER = os.path.join(BASE_DIR, 'parsed_data')
 os.makedirs(PARSED_DATA_FOLDER, exist_ok=True)
+IMAGE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'images')
+image_store = ImageStore(IMAGE_FOLDER)
+install_image_routes(app, image_store)
 
 # API Configuration
 COURSERA_API_KEY = "API KEY"
 GITHUB_API_KEY = "API KEY"
 VISUALIZATION_STYLE = 'whitegrid'
+# The seaborn theme as plain rcParams, applied inside the render workers
+# (minus its colormap, which only exists once seaborn is imported)
+CHART_RC = {
+    key: value
+    for key, value in {**sns.axes_style(VISUALIZATION_STYLE), **sns.plotting_context('notebook')}.items()
+    if key != 'image.cmap'
+}
+CHART_OPTIONS = {
+    'skill_match': {'figsize': (6, 6), 'dpi': 100, 'rc': CHART_RC},
+    'skill_radar': {'figsize': (8, 8), 'dpi': 100, 'rc': CHART_RC},
+}
+COURSERA_API_URL = "https://api.coursera.org/api/courses.v1"
+GITHUB_API_URL = "https://api.github.com/search/repositories"
+
+# Recommendation fan-out
+RECOMMENDATION_TIMEOUT = (3.05, 10)  # connect/read timeout per provider call
+RECOMMENDATION_DEADLINE = 8          # seconds for the whole fan-out
+MAX_FETCH_WORKERS = 8
+
+def _pooled_session(headers: dict) -> requests.Session:
+    """Keep-alive session whose pool fits every fetch worker"""
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_FETCH_WORKERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+coursera_session = _pooled_session({'Authorization': f'Bearer {COURSERA_API_KEY}'})
+github_session = _pooled_session({'Authorization': f'token {GITHUB_API_KEY}'})
+fetch_executor = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS, thread_name_prefix='recommend')
+
+# Per-skill recommendation cache shared by all users
+RECOMMENDATION_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'recommendations.db')
+RECOMMENDATION_CACHE_TTL = 24 * 60 * 60  # seconds
+recommendation_cache = TieredCache(
+    RECOMMENDATION_CACHE_PATH,
+    max_items=512,
+    ttl=RECOMMENDATION_CACHE_TTL,
+    max_disk_items=20000
+)
+
+# Skill groups shown on the radar chart
+SKILL_CATEGORIES = {
+    'Frontend': ['html', 'css', 'javascript', 'react', 'angular'],
+    'Backend': ['node.js', 'express', 'python', 'java', 'php'],
+    'Database': ['sql', 'mongodb', 'postgresql', 'mysql', 'firebase'],
+    'DevOps': ['aws', 'docker', 'kubernetes', 'git', 'ci/cd']
+}
+
+def normalize_skill(skill: str) -> str:
+    return ' '.join(skill.lower().split())
 
 def load_resume_data(email: str) -> dict:
-    """Load and clean resume data from parsed_data folder (using first gap only)"""
+    """Load the latest skill gap entry for a user from the store"""
     print(f"Loading resume data for email: {email}")
-    safe_email = email.replace('@', '_at_').replace('.', '_')
-    filepath = os.path.join(PARSED_DATA_FOLDER, f"{safe_email}.json")
 
     try:
-        with open(filepath, 'r') as f:
-            raw_data = json.load(f)
-
-            # Extract only the first gap entry
-            gap_list = raw_data.get('gap', [])
-            if not gap_list:
-                print(f"No 'gap' data found for {email}")
-                return None
-
-            first_gap = gap_list[-1]
-
-            # Build a simplified response using the first gap
-            data = {
-                "job_role": first_gap.get("job_role"),
-                "skills": first_gap.get("skills", []),
-                "candidate_skills": first_gap.get("candidate_skills", []),
-                "required_skills": first_gap.get("required_skills", []),
-                "match_percentage": first_gap.get("match_percentage"),
-                "skill_match_image": first_gap.get("images", {}).get("skill_match"),
-                "resume_text": " ".join(first_gap.get("skills", []))  # or candidate_skills
-            }
-
-            print(f"Resume data loaded successfully for {email}")
-            return data
+        # Use the most recent gap entry
+        latest_gap = get_store().latest_gap(email)
+        if not latest_gap:
+            print(f"No 'gap' data found for {email}")
+            return None
+
+        # Build a simplified response using the latest gap
+        data = {
+            "job_role": latest_gap.get("job_role"),
+            "skills": latest_gap.get("skills", []),
+            "candidate_skills": latest_gap.get("candidate_skills", []),
+            "required_skills": latest_gap.get("required_skills", []),
+            "match_percentage": latest_gap.get("match_percentage"),
+            "skill_match_image": latest_gap.get("images", {}).get("skill_match"),
+            "resume_text": " ".join(latest_gap.get("skills", []))  # or candidate_skills
+        }
+
+        print(f"Resume data loaded successfully for {email}")
+        return data
 
     except Exception as e:
         print(f"Error loading resume data: {str(e)}")
@@ -71,13 +125,11 @@ def load_resume_data(email: str) -> dict:
 def fetch_coursera_courses(skill: str) -> list:
     """Fetch courses from Coursera API"""
     print(f"Fetching Coursera courses for skill: {skill}")
-    url = f"https://api.coursera.org/api/courses.v1?q=search&query={quote_plus(skill)}&fields=name,primaryLanguages,partnerIds,slug"
-    headers = {'Authorization': f'Bearer {COURSERA_API_KEY}'}
+    url = f"{COURSERA_API_URL}?q=search&query={quote_plus(skill)}&fields=name,primaryLanguages,partnerIds,slug"
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = coursera_session.get(url, timeout=RECOMMENDATION_TIMEOUT)
         if response.status_code == 200:
-            print(f"Coursera API response: {response.json()}")
             return [{
                 'type': 'Course',
                 'platform': 'Coursera',
@@ -93,13 +145,11 @@ def fetch_coursera_courses(skill: str) -> list:
 def fetch_github_projects(skill: str) -> list:
     """Fetch relevant GitHub projects"""
     print(f"Fetching GitHub projects for skill: {skill}")
-    url = f"https://api.github.com/search/repositories?q={quote_plus(skill)}+in:readme+language:python"
-    headers = {'Authorization': f'token {GITHUB_API_KEY}'}
+    url = f"{GITHUB_API_URL}?q={quote_plus(skill)}+in:readme+language:python"
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = github_session.get(url, timeout=RECOMMENDATION_TIMEOUT)
         if response.status_code == 200:
-            print(f"GitHub API response: {response.json()}")
             return [{
                 'type': 'Project',
                 'platform': 'GitHub',
@@ -113,73 +163,88 @@ def fetch_github_projects(skill: str) -> list:
         print(f"Error fetching GitHub projects: {str(e)}")
     return []
 
-def generate_visualizations(analysis: dict) -> dict:
-    """Generate visualizations and return as base64 encoded images"""
-    print("Generating visualizations...")
-    sns.set_theme(style=VISUALIZATION_STYLE)
-    visualizations = {}
-
-    # Skill Match Gauge
-    fig, ax = plt.subplots(figsize=(6, 6))
-    match_percentage = analysis.get('match_percentage', 0)
-    ax.barh([0], [match_percentage], 
-            color=['green' if match_percentage >= 70 
-                  else 'yellow' if match_percentage >= 40 
-                  else 'red'])
-    ax.set_xlim(0, 100)
-    ax.set_yticks([])
-    ax.set_xlabel('Skill Match Percentage')
-    ax.set_title('Skill Match Percentage', pad=20)
-    ax.text(match_percentage, 0, f'{match_percentage:.1f}%', 
-           ha='center', va='center', color='black', fontweight='bold')
-    
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight', dpi=100)
-    visualizations['skill_match'] = base64.b64encode(buf.getvalue()).decode('utf-8')
-    plt.close(fig)
-
-    # Skill Radar Chart
-    # Skill Radar Chart
-    categories = {
-    'Frontend': ['html', 'css', 'javascript', 'react', 'angular'],
-    'Backend': ['node.js', 'express', 'python', 'java', 'php'],
-    'Database': ['sql', 'mongodb', 'postgresql', 'mysql', 'firebase'],
-    'DevOps': ['aws', 'docker', 'kubernetes', 'git', 'ci/cd']
+def _fetch_and_cache(provider: str, skill: str, fetch) -> list:
+    results = fetch(skill)
+    if results:  # failed calls return [] and should be retried next time
+        recommendation_cache.set(f"{provider}:{skill}", results)
+    return results
+
+def fetch_recommendations(skills: list, deadline: float = RECOMMENDATION_DEADLINE) -> tuple:
+    """Fetch courses and projects for every skill concurrently.
+
+    Cached (provider, skill) pairs are answered from the recommendation cache;
+    the rest are requested once each. Calls still running when the deadline
+    passes are dropped, so the result may be partial; the second return value
+    lists the pairs that timed out. ``deadline=None`` waits for every call.
+    """
+    providers = (('coursera', fetch_coursera_courses), ('github', fetch_github_projects))
+    slots = []  # cached results or futures, in response order
+    tasks = []
+    for skill in dict.fromkeys(normalize_skill(s) for s in skills):
+        for provider, fetch in providers:
+            cached = recommendation_cache.get(f"{provider}:{skill}")
+            if cached is not None:
+                slots.append(cached)
+            else:
+                future = fetch_executor.submit(_fetch_and_cache, provider, skill, fetch)
+                tasks.append((provider, skill, future))
+                slots.append(future)
+
+    wait([future for _, _, future in tasks], timeout=deadline)
+
+    recommendations = []
+    for slot in slots:
+        if isinstance(slot, list):
+            recommendations.extend(slot)
+        elif slot.done():
+            recommendations.extend(slot.result())
+
+    timed_out = []
+    for provider, skill, future in tasks:
+        if not future.done():
+            future.cancel()
+            timed_out.append({'provider': provider, 'skill': skill})
+    return recommendations, timed_out
+
+def prewarm_recommendation_cache(skills=None) -> dict:
+    """Fill the cache for the whole skill taxonomy (or the given skills)"""
+    if skills is None:
+        skills = list(taxonomy.displays)  # canonical names
+    skills = list(dict.fromkeys(normalize_skill(s) for s in skills))  # as fetch_recommendations keys them
+    recommendations, _ = fetch_recommendations(skills, deadline=None)
+    print(f"Pre-warmed {len(skills)} skills ({len(recommendations)} recommendations)")
+    return recommendation_cache.stats()
+
+def build_chart_jobs(analysis: dict) -> dict:
+    """Chart series for the analysis as {name: (draw, data, render options)}"""
+    match_percentage = analysis.get('match_percentage') or 0
+    jobs = {
+        'skill_match': (draw_skill_match_gauge, {'type': 'gauge', 'match_percentage': match_percentage},
+                        CHART_OPTIONS['skill_match'])
     }
 
+    # Skill Radar Chart
     radar_data = []
-    for category, skills in categories.items():
+    for category, skills in SKILL_CATEGORIES.items():
        total = len([s for s in skills if s in analysis['required_skills']])
        if total > 0:
          matched = len([s for s in skills if s in analysis['required_skills'] and s in analysis['matched_skills']])
          radar_data.append({'category': category, 'percentage': (matched / total) * 100})
 
-
     if radar_data:
-        df = pd.DataFrame(radar_data)
-        N = len(df)
-        angles = [n / float(N) * 2 * pi for n in range(N)] + [0]
-        values = df['percentage'].tolist() + [df['percentage'].tolist()[0]]
-
-        fig = plt.figure(figsize=(8, 8))
-        ax = fig.add_subplot(111, polar=True)
-        ax.plot(angles, values, linewidth=2, linestyle='solid', 
-               color='#1f77b4', marker='o', markersize=8)
-        ax.fill(angles, values, '#1f77b4', alpha=0.25)
-        ax.set_xticks(angles[:-1])
-        ax.set_xticklabels(df['category'], size=12)
-        ax.set_rlabel_position(30)
-        plt.yticks([20, 40, 60, 80], ["20%", "40%", "60%", "80%"], color="grey", size=10)
-        plt.ylim(0, 100)
-        plt.title('Skill Match by Category', size=14, pad=20)
-        
-        buf = BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight', dpi=100)
-        visualizations['skill_radar'] = base64.b64encode(buf.getvalue()).decode('utf-8')
-        plt.close(fig)
+        jobs['skill_radar'] = (draw_skill_radar, {
+            'type': 'radar',
+            'categories': [row['category'] for row in radar_data],
+            'percentages': [row['percentage'] for row in radar_data]
+        }, CHART_OPTIONS['skill_radar'])
+    return jobs
 
+def generate_visualizations(analysis: dict) -> dict:
+    """Generate visualizations and return their content-hashed image URLs"""
+    print("Generating visualizations...")
+    pngs = renderer.render_many(build_chart_jobs(analysis))
     print("Visualizations generated successfully.")
-    return visualizations
+    return {name: f'/api/images/{image_store.put_content(png)}' for name, png in pngs.items()}
 
 
 @app.route('/api/learn', methods=['POST'])
@@ -213,16 +278,17 @@ def analyze():
 
         # print(f"Analysis data for {email}: {analysis}")
 
-        # Generate visualizations
-        visualizations = generate_visualizations(analysis)
+        # Generate visualizations, or just their data when the client draws them
+        if chart_mode(request) == 'data':
+            charts = {"chart_data": chart_data(build_chart_jobs(analysis))}
+        else:
+            charts = {"visualizations": generate_visualizations(analysis)}
 
         # Generate recommendations
-        recommendations = []
-        for skill in analysis['missing_skills'][:3]:
-            recommendations.extend(fetch_coursera_courses(skill))
-            recommendations.extend(fetch_github_projects(skill))
-            print(fetch_coursera_courses(skill))
-        print(recommendations)
+        recommendations, timed_out = fetch_recommendations(analysis['missing_skills'][:3])
+        if timed_out:
+            print(f"Recommendation calls past the deadline: {timed_out}")
+        print(f"Fetched {len(recommendations)} recommendations")
         # Prepare response
         response = {
             "timestamp": datetime.now().isoformat(),
@@ -232,7 +298,7 @@ def analyze():
             "matched_skills": analysis['matched_skills'],
             "missing_skills": analysis['missing_skills'],
             "recommendations": recommendations,
-            "visualizations": visualizations
+            **charts
         }
 
         # print(f"Analysis response for {email}: {response}")
@@ -248,30 +314,28 @@ def analyze():
 
 
 def save_analysis_result(email: str, analysis: dict):
-    """Save analysis results to parsed_data folder"""
+    """Append analysis results to the user's gap_analyses history"""
     print(f"Saving analysis result for {email}")
-    safe_email = email.replace('@', '_at_').replace('.', '_')
-    filepath = os.path.join(PARSED_DATA_FOLDER, f"{safe_email}.json")
-    
     try:
-        existing_data = {}
-        if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                existing_data = json.load(f)
-        
-        if 'gap_analyses' not in existing_data:
-            existing_data['gap_analyses'] = []
-        
-        existing_data['gap_analyses'].append(analysis)
-        
-        with open(filepath, 'w') as f:
-            json.dump(existing_data, f, indent=2)
-
+        get_store().append_gap_analysis(email, analysis)
         print(f"Analysis saved successfully for {email}")
 
     except Exception as e:
         print(f"Error saving analysis: {str(e)}")
 
+@app.route('/api/learn/cache-stats', methods=['GET'])
+def recommendation_cache_stats():
+    return jsonify({**recommendation_cache.stats(), 'charts': renderer.stats(), 'images': image_store.stats()}), 200
+
 if __name__ == '__main__':
+    # python main3.py prewarm [skills.txt]  -> fill the recommendation cache offline
+    if len(sys.argv) > 1 and sys.argv[1] == 'prewarm':
+        skills = None
+        if len(sys.argv) > 2:
+            with open(sys.argv[2], 'r') as f:
+                skills = [line.strip() for line in f if line.strip()]
+        print(prewarm_recommendation_cache(skills))
+        sys.exit(0)
+
     print("Starting Flask server...")
     app.run(debug=True, port=5002)
@@ -1,60 +1,112 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from transformers import BertTokenizerFast, BertForTokenClassification
-import fitz  # PyMuPDF
+from transformers import BertTokenizerFast
+from sentence_transformers import SentenceTransformer
 import os
 import json
-import torch
+import hashlib
+import threading
 from itertools import groupby
+from ner_batcher import MicroBatcher
+from ner_backends import load_backend, checkpoint_id
+from shared.cache import TieredCache
+from shared.text_extraction import extract_text
+from shared.store import get_store
+from shared.skills import taxonomy
+from shared.embeddings import MINILM_MODEL, embed_sections, embedding_version, text_key
+from shared.model_registry import models, install_health_routes
 
 app = Flask(__name__)
 CORS(app, expose_headers=["Content-Type"])
+install_health_routes(app)
 
-# Load model and tokenizer
+# Model and tokenizer (loaded lazily through the registry)
 MODEL_DIR = "C:\\Users\\vanshika\\Downloads\\model\\resume\\checkpoint"
+NER_BACKEND = "torch"  # "torch", "onnx" or "onnx-int8" (see ner_backends.py)
+tokenizer_lock = threading.Lock()
 
-model = BertForTokenClassification.from_pretrained(MODEL_DIR)
-tokenizer = BertTokenizerFast.from_pretrained(MODEL_DIR)
-id2label = model.config.id2label
-
-def extract_text_from_pdf(path):
-    text = ""
-    with fitz.open(path) as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
-
-def get_entities(text):
-    encoding = tokenizer(
-        text,
-        return_tensors="pt",
-        truncation=True,
-        max_length=512,
-        return_offsets_mapping=True
+# Sliding-window NER settings
+MAX_LENGTH = 512
+WINDOW_STRIDE = 128  # tokens shared between consecutive windows
+
+# Cross-request micro-batching
+NER_MAX_BATCH_SIZE = 32  # windows per forward pass
+NER_MAX_WAIT_MS = 5      # how long the batcher waits for more windows
+
+# Parse results keyed by PDF content, shared by every user who uploads the same file
+PARSE_CACHE_PATH = os.path.join("parse_cache", "parse_cache.db")
+PARSE_CACHE_MEMORY_ITEMS = 256
+CHECKPOINT_ID = f"{checkpoint_id(MODEL_DIR, NER_BACKEND)}:w{MAX_LENGTH}s{WINDOW_STRIDE}"
+parse_cache = TieredCache(PARSE_CACHE_PATH, max_items=PARSE_CACHE_MEMORY_ITEMS)
+
+# Document and section embeddings stored at ingest for Compare to reuse
+EMBEDDING_VERSION = embedding_version(MINILM_MODEL)
+
+def load_batcher():
+    return MicroBatcher(
+        models.get("ner_backend"),
+        max_batch_size=NER_MAX_BATCH_SIZE,
+        max_wait_ms=NER_MAX_WAIT_MS,
+        pad_token_id=models.get("ner_tokenizer").pad_token_id
     )
-    inputs = {k: v for k, v in encoding.items() if k != "offset_mapping"}
-    offsets = encoding["offset_mapping"][0].numpy()
-
-    with torch.no_grad():
-        outputs = model(**inputs)
-    logits = outputs.logits
-    predictions = torch.argmax(logits, dim=2)[0].numpy()
-    tokens = tokenizer.convert_ids_to_tokens(inputs["input_ids"][0])
-
-    results = []
-    for token, pred_id, offset in zip(tokens, predictions, offsets):
-        if offset[0] == offset[1]:
-            continue
-        label = id2label[pred_id]
-        results.append((token, label))
-    return results
+
+models.register("ner_tokenizer", lambda: BertTokenizerFast.from_pretrained(MODEL_DIR))
+models.register("ner_backend", lambda: load_backend(NER_BACKEND, MODEL_DIR))
+models.register("ner_batcher", load_batcher)
+models.register("minilm", lambda: SentenceTransformer(MINILM_MODEL))
+
+def get_entities(text, windowed=True):
+    """Run token-level NER over the text.
+
+    In windowed mode the text is split into overlapping MAX_LENGTH-token
+    windows so nothing past the first 512 tokens is dropped. The windows are
+    queued on the shared batcher, which pads them together with windows from
+    concurrent requests. Tokens seen by several windows keep the prediction
+    from the window where they sit furthest from an edge.
+    """
+    tokenizer = models.get("ner_tokenizer")
+    id2label = models.get("ner_backend").id2label
+
+    # The Rust tokenizer mutates its truncation state per call and is not
+    # safe to share across request threads
+    with tokenizer_lock:
+        encoding = tokenizer(
+            text,
+            truncation=True,
+            max_length=MAX_LENGTH,
+            stride=WINDOW_STRIDE,
+            return_overflowing_tokens=windowed,
+            return_offsets_mapping=True
+        )
+    model_keys = [k for k in encoding.keys()
+                  if k not in ("offset_mapping", "overflow_to_sample_mapping")]
+    all_offsets = encoding["offset_mapping"]
+    if not windowed:
+        encoding = {k: [encoding[k]] for k in model_keys}
+        all_offsets = [all_offsets]
+    windows = [{k: encoding[k][w] for k in model_keys} for w in range(len(all_offsets))]
+
+    predictions = models.get("ner_batcher").submit(windows)
+
+    # offset -> (distance from window edge, token, label)
+    best = {}
+    for window, offsets, preds in zip(windows, all_offsets, predictions):
+        tokens = tokenizer.convert_ids_to_tokens(window["input_ids"])
+        positions = [i for i, (start, end) in enumerate(offsets) if start != end]
+        for rank, i in enumerate(positions):
+            key = tuple(offsets[i])
+            depth = min(rank, len(positions) - 1 - rank)
+            if key not in best or depth > best[key][0]:
+                best[key] = (depth, tokens[i], id2label[int(preds[i])])
+
+    return [(token, label) for _, (_, token, label) in sorted(best.items())]
 
 def merge_entities(results):
     merged = []
     for label, group in groupby(results, key=lambda x: x[1]):
         if label != "O":
             tokens = [token for token, _ in group]
-            entity = tokenizer.convert_tokens_to_string(tokens).strip()
+            entity = models.get("ner_tokenizer").convert_tokens_to_string(tokens).strip()
             merged.append({"label": label, "text": entity})
     return merged
 
@@ -84,14 +136,67 @@ def structure_entities(merged, raw_text):
         "VS Code", "Data Structures and Algorithms", "Operating System",
         "DSA", "Git", "FastAPI", "Computer Networking","JavaScript","C++","css","sql"
     ]
+    found = set(taxonomy.skills(raw_text))
+    # One spelling per canonical skill: "DSA" and "Data Structures and
+    # Algorithms" are the same taxonomy entry
+    listed = {taxonomy.canonical(skill) for skill in structured["skills"]}
     for skill in manual_skills:
-        if skill.lower() in raw_text.lower():
-            if skill not in structured["skills"]:
-                structured["skills"].append(skill)
+        canonical = taxonomy.canonical(skill)
+        if canonical in found and canonical not in listed:
+            structured["skills"].append(skill)
+            listed.add(canonical)
 
     return structured
 
 
+def parse_resume_pdf(pdf_bytes):
+    """Run extraction and NER on PDF bytes and return (structured, formatted_entities, text)"""
+    # 1) RAW TEXT
+    text = extract_text(pdf_bytes, filename="resume.pdf", sep="")
+    print("\n\n===== RAW EXTRACTED TEXT =====\n")
+    print(text)
+    print("\n===== END RAW TEXT =====\n")
+
+    # 2) TOKEN‑LEVEL NER
+    ner_results = get_entities(text)
+    print("\n\n===== TOKEN-LEVEL NER OUTPUT =====\n")
+    for token, label in ner_results[:100]:  # first 100 tokens
+        print(f"{token:>10} → {label}")
+    print(f"... (total tokens: {len(ner_results)})")
+    print("\n===== END TOKEN NER =====\n")
+
+    # 3) MERGED ENTITIES
+    merged = merge_entities(ner_results)
+    print("\n\n===== MERGED ENTITIES =====\n")
+    for ent in merged:
+        print(f"{ent['label']}: {ent['text']}")
+    print("\n===== END MERGED =====\n")
+
+    # 4) STRUCTURED JSON
+    structured = structure_entities(merged,text)
+    print("\n\n===== STRUCTURED OUTPUT =====\n")
+    print(json.dumps(structured, indent=2))
+    print("\n===== END STRUCTURED =====\n")
+
+    formatted_entities = [f"B-{ent['label']}: {ent['text']}" for ent in merged]
+    return structured, formatted_entities, text
+
+
+def store_embeddings(text_hash, get_text):
+    """Embed the resume and its sections once per text and model version"""
+    store = get_store()
+    vectors = store.load_all_embeddings(text_hash, EMBEDDING_VERSION)
+    if "document" not in vectors:
+        vectors = embed_sections(models.get("minilm"), get_text())
+        store.save_embeddings(text_hash, EMBEDDING_VERSION, vectors)
+        print(f"Stored {len(vectors)} embeddings for {text_hash[:12]}")
+    return {
+        "text_hash": text_hash,
+        "model": EMBEDDING_VERSION,
+        "sections": sorted(kind.split(":", 1)[1] for kind in vectors if kind.startswith("section:"))
+    }
+
+
 @app.route("/api/resume-parser", methods=["POST"])
 def upload_resume():
     if "file" not in request.files or "userEmail" not in request.form:
@@ -103,58 +208,57 @@ def upload_resume():
     if file.filename == "":
         return jsonify({"error": "No selected file"}), 400
 
-    temp_path = "temp.pdf"
-    file.save(temp_path)
+    pdf_bytes = file.read()
+    cache_key = f"{hashlib.sha256(pdf_bytes).hexdigest()}:{CHECKPOINT_ID}"
 
     try:
-        # 1) RAW TEXT
-        text = extract_text_from_pdf(temp_path)
-        print("\n\n===== RAW EXTRACTED TEXT =====\n")
-        print(text)
-        print("\n===== END RAW TEXT =====\n")
-
-        # 2) TOKEN‑LEVEL NER
-        ner_results = get_entities(text)
-        print("\n\n===== TOKEN-LEVEL NER OUTPUT =====\n")
-        for token, label in ner_results[:100]:  # first 100 tokens
-            print(f"{token:>10} → {label}")
-        print(f"... (total tokens: {len(ner_results)})")
-        print("\n===== END TOKEN NER =====\n")
-
-        # 3) MERGED ENTITIES
-        merged = merge_entities(ner_results)
-        print("\n\n===== MERGED ENTITIES =====\n")
-        for ent in merged:
-            print(f"{ent['label']}: {ent['text']}")
-        print("\n===== END MERGED =====\n")
-
-        # 4) STRUCTURED JSON
-        structured = structure_entities(merged,text)
-        print("\n\n===== STRUCTURED OUTPUT =====\n")
-        print(json.dumps(structured, indent=2))
-        print("\n===== END STRUCTURED =====\n")
-
-        # format and save
-        formatted_entities = [f"B-{ent['label']}: {ent['text']}" for ent in merged]
-        safe_name = user_email.replace("@", "_at_").replace(".", "_")
-        os.makedirs("parsed_data", exist_ok=True)
-        out_path = f"parsed_data/{safe_name}.json"
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(structured, f, indent=2)
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            print(f"Parse cache hit for {cache_key}")
+            structured = cached["structured"]
+            formatted_entities = cached["entities"]
+            text_hash = cached.get("text_hash")
+            text = None
+        else:
+            structured, formatted_entities, text = parse_resume_pdf(pdf_bytes)
+            text_hash = text_key(text)
+            parse_cache.set(cache_key, {
+                "structured": structured,
+                "entities": formatted_entities,
+                "text_hash": text_hash
+            })
+
+        def get_text():
+            return text if text is not None else extract_text(pdf_bytes, filename="resume.pdf", sep="")
+
+        if text_hash is None:  # cached before text hashes were recorded
+            text_hash = text_key(get_text())
+
+        # save, with a reference to the stored embeddings
+        record = dict(structured)
+        try:
+            record["embeddings"] = store_embeddings(text_hash, get_text)
+        except Exception as e:
+            print(f"Embedding at ingest failed, consumers will encode on demand: {e}")
+        get_store().save_resume(user_email, record)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-
     return jsonify({
         "data": structured,
         "entities": formatted_entities
     }), 200
 
+@app.route("/api/resume-parser/stats", methods=["GET"])
+def ner_stats():
+    batcher = models.get("ner_batcher") if models.is_loaded("ner_batcher") else None
+    return jsonify({
+        "batcher": batcher.stats() if batcher else None,
+        "parse_cache": parse_cache.stats()
+    }), 200
+
 if __name__ == "__main__":
-    os.makedirs("parsed_data", exist_ok=True)
-    app.run(debug=True, port=5001)
+    models.warm_up()
+    app.run(debug=True, port=5001, threaded=True)
 
@@ -0,0 +1,166 @@
+"""Load test: concurrent resume uploads against a stub NER backend.
+
+Registers a tokenizer whose vocabulary is the test documents' words, a stub
+NER backend that labels tokens by id (sleeping a little per forward pass so
+windows from concurrent requests end up in the same batches) and a stub
+sentence encoder; the parse cache and resume store live in a temporary
+directory. Every document is made of its own words, so a window,
+prediction or tokenizer state crossing from one request to another shows
+up as a missing or unexpected entity.
+
+The PDFs are uploaded once serially and then all at once from a thread
+pool; every response must list exactly the entities of its own PDF.
+
+    python bench_uploads.py [documents] [threads]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz  # PyMuPDF
+import numpy as np
+from transformers import BertTokenizerFast
+
+import app
+from shared.cache import TieredCache
+from shared.store import ResumeStore
+
+SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+ENTITY_EVERY = 7  # one entity word per this many words
+WORDS_PER_LINE = 12
+LINES_PER_PAGE = 45
+
+
+class StubNERBackend:
+    """Labels the tokens whose ids are in ``entity_ids`` as SKILL"""
+    name = "stub"
+    id2label = {0: "O", 1: "SKILL"}
+
+    def __init__(self, entity_ids, delay=0.002):
+        self.entity_ids = np.array(sorted(entity_ids), dtype=np.int64)
+        self.delay = delay
+
+    def __call__(self, batch):
+        time.sleep(self.delay)
+        return np.isin(batch["input_ids"], self.entity_ids).astype(np.int64)
+
+
+class StubEncoder:
+    """Hashed bag of words in place of MiniLM"""
+    dimension = 32
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True):
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                vectors[row, zlib.crc32(word.encode("utf-8")) % self.dimension] += 1
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1)
+
+
+def document_words(doc, rng):
+    """Words of one document; entity words are never adjacent, so each is its own entity"""
+    n_words = rng.randint(600, 1500)
+    return [f"s{doc}n{i}" if i % ENTITY_EVERY == 3 else f"w{doc}n{i}" for i in range(n_words)]
+
+
+def make_pdf(words):
+    lines = [" ".join(words[i:i + WORDS_PER_LINE]) for i in range(0, len(words), WORDS_PER_LINE)]
+    with fitz.open() as doc:
+        for start in range(0, len(lines), LINES_PER_PAGE):
+            page = doc.new_page()
+            for row, line in enumerate(lines[start:start + LINES_PER_PAGE]):
+                page.insert_text((36, 40 + row * 16), line, fontsize=9)
+        return doc.tobytes()
+
+
+def install_stubs(directory, documents):
+    vocab_path = os.path.join(directory, "vocab.txt")
+    vocabulary = SPECIAL_TOKENS + [word for words in documents for word in words]
+    with open(vocab_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(vocabulary) + "\n")
+    tokenizer = BertTokenizerFast(vocab_file=vocab_path)
+    entity_ids = [i for i, word in enumerate(vocabulary) if word.startswith("s")]
+
+    app.models.register("ner_tokenizer", lambda: tokenizer)
+    app.models.register("ner_backend", lambda: StubNERBackend(entity_ids))
+    app.models.register("minilm", StubEncoder)
+    store = ResumeStore(os.path.join(directory, "store.db"))
+    app.get_store = lambda: store
+
+
+def upload_all(pdfs, threads, directory, label):
+    """{doc: (status, json)} for every PDF, through a fresh parse cache"""
+    app.parse_cache = TieredCache(os.path.join(directory, f"parse_cache_{label}.db"))
+
+    def upload(doc):
+        response = app.app.test_client().post(
+            "/api/resume-parser",
+            data={"file": (io.BytesIO(pdfs[doc]), f"resume{doc}.pdf"), "userEmail": f"user{doc}@example.com"},
+            content_type="multipart/form-data"
+        )
+        return doc, (response.status_code, response.get_json())
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = dict(pool.map(upload, range(len(pdfs))))
+    return results, time.perf_counter() - start
+
+
+def mismatches(results, expected):
+    """(doc, problem) for every response that is not exactly its own entities"""
+    problems = []
+    for doc, (status, body) in sorted(results.items()):
+        if status != 200:
+            problems.append((doc, f"status {status}: {body}"))
+            continue
+        entities = body["entities"]
+        own = set(expected[doc])
+        unexpected = [e for e in entities if e not in own]
+        if unexpected:
+            problems.append((doc, f"{len(unexpected)} unexpected entities, e.g. {unexpected[0]}"))
+        elif entities != expected[doc]:
+            problems.append((doc, f"{len(entities)} entities, expected {len(expected[doc])}"))
+    return problems
+
+
+def main(n_docs=32, threads=16, seed=0):
+    rng = random.Random(seed)
+    documents = [document_words(doc, rng) for doc in range(n_docs)]
+    expected = [[f"B-SKILL: {word}" for word in words if word.startswith("s")] for words in documents]
+    pdfs = [make_pdf(words) for words in documents]
+
+    with tempfile.TemporaryDirectory() as directory:
+        install_stubs(directory, documents)
+        # parse_resume_pdf prints every document it parses
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial, serial_seconds = upload_all(pdfs, 1, directory, "serial")
+            concurrent, concurrent_seconds = upload_all(pdfs, threads, directory, "concurrent")
+        batcher = app.models.get("ner_batcher").stats()
+
+    failed = False
+    for label, results, seconds in (("serial", serial, serial_seconds),
+                                    ("concurrent", concurrent, concurrent_seconds)):
+        problems = mismatches(results, expected)
+        print(f"{label:>10}: {n_docs} uploads in {seconds * 1000:8.1f} ms, {len(problems)} mismatched")
+        for doc, problem in problems[:5]:
+            print(f"            resume{doc}.pdf: {problem}")
+        failed = failed or bool(problems)
+    print(f"   batcher: {batcher['windows']} windows in {batcher['forward_passes']} forward passes, "
+          f"avg batch {batcher['avg_batch_size']}")
+    if failed:
+        raise SystemExit("FAILED: responses did not match their own uploads")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
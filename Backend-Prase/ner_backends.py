@@ -0,0 +1,183 @@
+"""Inference backends for the resume NER checkpoint.
+
+Every backend is a callable that takes a padded batch (dict of int64 arrays
+shaped [batch, length]) and returns predicted label ids of the same shape, so
+any of them can be handed to MicroBatcher.
+
+    python ner_backends.py export <model_dir> [--int8]
+    python ner_backends.py compare <model_dir> resume1.pdf resume2.txt ...
+"""
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+from transformers import AutoConfig
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+ONNX_FILENAME = "model.onnx"
+ONNX_INT8_FILENAME = "model.int8.onnx"
+
+
+class TorchBackend:
+    name = "torch"
+
+    def __init__(self, model_dir):
+        import torch
+        from transformers import BertForTokenClassification
+
+        self._torch = torch
+        self.model = BertForTokenClassification.from_pretrained(model_dir)
+        self.model.eval()
+        self.id2label = self.model.config.id2label
+
+    def __call__(self, batch):
+        inputs = {k: self._torch.from_numpy(v) for k, v in batch.items()}
+        with self._torch.no_grad():
+            outputs = self.model(**inputs)
+        return self._torch.argmax(outputs.logits, dim=2).numpy()
+
+
+class OnnxBackend:
+    name = "onnx"
+
+    def __init__(self, onnx_path, model_dir, num_threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.id2label = AutoConfig.from_pretrained(model_dir).id2label
+        self.path = onnx_path
+
+    def __call__(self, batch):
+        feed = {name: batch[name] for name in self.input_names if name in batch}
+        logits = self.session.run(["logits"], feed)[0]
+        return np.argmax(logits, axis=2)
+
+
+def export_onnx(model_dir, output_dir, quantize=False):
+    """Export the checkpoint to ONNX, optionally with dynamic int8 weights"""
+    import torch
+    from transformers import BertForTokenClassification
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, ONNX_FILENAME)
+
+    if not os.path.exists(fp32_path):
+        model = BertForTokenClassification.from_pretrained(model_dir)
+        model.eval()
+        dummy = {
+            "input_ids": torch.ones(1, 16, dtype=torch.long),
+            "attention_mask": torch.ones(1, 16, dtype=torch.long),
+            "token_type_ids": torch.zeros(1, 16, dtype=torch.long),
+        }
+        dynamic = {0: "batch", 1: "sequence"}
+        torch.onnx.export(
+            model,
+            (dummy["input_ids"], dummy["attention_mask"], dummy["token_type_ids"]),
+            fp32_path,
+            input_names=list(dummy),
+            output_names=["logits"],
+            dynamic_axes={name: dynamic for name in list(dummy) + ["logits"]},
+            opset_version=14,
+        )
+        print(f"Exported {fp32_path}")
+
+    if not quantize:
+        return fp32_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = os.path.join(output_dir, ONNX_INT8_FILENAME)
+    if not os.path.exists(int8_path):
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        print(f"Quantized {int8_path}")
+    return int8_path
+
+
+def load_backend(name, model_dir, onnx_dir=None, num_threads=None):
+    """Build the named backend, exporting the ONNX graph on first use"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown NER backend '{name}', expected one of {BACKENDS}")
+    if name == "torch":
+        return TorchBackend(model_dir)
+
+    onnx_dir = onnx_dir or os.path.join(model_dir, "onnx")
+    path = export_onnx(model_dir, onnx_dir, quantize=(name == "onnx-int8"))
+    backend = OnnxBackend(path, model_dir, num_threads=num_threads)
+    backend.name = name
+    return backend
+
+
+def checkpoint_id(model_dir, backend_name):
+    """Short id that changes whenever the checkpoint files or backend change"""
+    digest = hashlib.sha1(f"{os.path.abspath(model_dir)}:{backend_name}".encode("utf-8"))
+    if os.path.isdir(model_dir):
+        for name in sorted(os.listdir(model_dir)):
+            path = os.path.join(model_dir, name)
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _read_text(path):
+    if path.lower().endswith(".pdf"):
+        import fitz
+        with fitz.open(path) as doc:
+            return "".join(page.get_text() for page in doc)
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+def _padded_windows(tokenizer, texts, max_length=512, stride=128):
+    encoding = tokenizer(texts, truncation=True, max_length=max_length, stride=stride,
+                         return_overflowing_tokens=True, padding=True, return_tensors="np")
+    return {k: encoding[k].astype(np.int64)
+            for k in ("input_ids", "attention_mask", "token_type_ids") if k in encoding}
+
+
+def compare_backends(model_dir, texts, candidates=("onnx", "onnx-int8"), repeats=5):
+    """Label agreement and speedup of each backend against the PyTorch path"""
+    from transformers import BertTokenizerFast
+
+    tokenizer = BertTokenizerFast.from_pretrained(model_dir)
+    batch = _padded_windows(tokenizer, texts)
+    mask = batch["attention_mask"].astype(bool)
+
+    def timed(backend):
+        backend(batch)  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            preds = backend(batch)
+        return preds, (time.perf_counter() - start) / repeats
+
+    reference, ref_time = timed(TorchBackend(model_dir))
+    report = {"torch": {"seconds": round(ref_time, 4), "speedup": 1.0, "agreement": 1.0}}
+    for name in candidates:
+        preds, seconds = timed(load_backend(name, model_dir))
+        report[name] = {
+            "seconds": round(seconds, 4),
+            "speedup": round(ref_time / seconds, 2),
+            "agreement": round(float((preds[mask] == reference[mask]).mean()), 4),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("export", "compare"):
+        print(__doc__)
+        sys.exit(1)
+
+    command, model_dir, args = sys.argv[1], sys.argv[2], sys.argv[3:]
+    if command == "export":
+        export_onnx(model_dir, os.path.join(model_dir, "onnx"), quantize="--int8" in args)
+    else:
+        report = compare_backends(model_dir, [_read_text(p) for p in args])
+        for name, row in report.items():
+            print(f"{name:>10}: {row['seconds']:.4f}s  x{row['speedup']:<5} agreement {row['agreement']:.2%}")
@@ -0,0 +1,133 @@
+import threading
+import time
+import queue
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class _Job:
+    __slots__ = ("window", "future", "enqueued_at")
+
+    def __init__(self, window):
+        self.window = window
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """Collects tokenized windows from concurrent requests into shared forward passes.
+
+    A single worker thread waits up to ``max_wait_ms`` (or until
+    ``max_batch_size`` windows are queued), groups the collected windows by
+    padded length bucket and runs one forward pass per bucket. ``forward``
+    receives a dict of int64 arrays shaped ``[batch, length]`` and must return
+    the predicted label ids with the same shape.
+    """
+
+    def __init__(self, forward, max_batch_size=32, max_wait_ms=5, bucket_size=64,
+                 pad_token_id=0, latency_window=1000):
+        self.forward = forward
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.bucket_size = bucket_size
+        self.pad_token_id = pad_token_id
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._windows = 0
+        self._forwards = 0
+        self._forward_time = 0.0
+        self._latencies = deque(maxlen=latency_window)
+
+        self._worker = threading.Thread(target=self._run, name="ner-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, windows, timeout=None):
+        """Queue the windows of one request and block until all are predicted"""
+        start = time.perf_counter()
+        jobs = [_Job(window) for window in windows]
+        for job in jobs:
+            self._queue.put(job)
+        predictions = [job.future.result(timeout=timeout) for job in jobs]
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+        return predictions
+
+    def stats(self):
+        """Queue depth, batch-size histogram and request latency percentiles"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            batches = sum(self._batch_sizes.values())
+            stats = {
+                "queue_depth": self._queue.qsize(),
+                "batches": batches,
+                "windows": self._windows,
+                "forward_passes": self._forwards,
+                "avg_batch_size": round(self._windows / batches, 2) if batches else 0,
+                "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+                "avg_forward_ms": round(self._forward_time / self._forwards * 1000, 2) if self._forwards else 0,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+        for name, q in (("p50_ms", 0.50), ("p99_ms", 0.99)):
+            stats[name] = round(latencies[int(q * (len(latencies) - 1))] * 1000, 2) if latencies else 0
+        return stats
+
+    def _collect(self):
+        jobs = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(jobs) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                jobs.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return jobs
+
+    def _bucket(self, length):
+        return -(-length // self.bucket_size) * self.bucket_size
+
+    def _run(self):
+        while True:
+            jobs = self._collect()
+            buckets = {}
+            for job in jobs:
+                length = len(job.window["input_ids"])
+                buckets.setdefault(self._bucket(length), []).append(job)
+
+            with self._lock:
+                self._batch_sizes[len(jobs)] += 1
+                self._windows += len(jobs)
+
+            for width, group in buckets.items():
+                self._run_bucket(width, group)
+
+    def _run_bucket(self, width, jobs):
+        try:
+            batch = {}
+            for key in jobs[0].window:
+                pad = self.pad_token_id if key == "input_ids" else 0
+                arr = np.full((len(jobs), width), pad, dtype=np.int64)
+                for row, job in enumerate(jobs):
+                    values = job.window[key]
+                    arr[row, :len(values)] = values
+                batch[key] = arr
+
+            start = time.perf_counter()
+            predictions = self.forward(batch)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._forwards += 1
+                self._forward_time += elapsed
+
+            for row, job in enumerate(jobs):
+                job.future.set_result(predictions[row, :len(job.window["input_ids"])])
+        except Exception as e:
+            for job in jobs:
+                if not job.future.done():
+                    job.future.set_exception(e)
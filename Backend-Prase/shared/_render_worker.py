@@ -0,0 +1,22 @@
+"""Main module of chart worker processes (see shared.worker_processes).
+
+Imports only matplotlib; the ``draw_*`` functions are imported by reference
+when a job is unpickled, from the service's own ``charts`` module. Figures
+are created directly (never through pyplot), so no GUI backend is involved.
+"""
+import io
+import time
+
+import matplotlib
+from matplotlib.figure import Figure
+
+
+def render_png(draw, data, figsize, dpi, rc=None):
+    """Draw one chart on a fresh Figure and return (PNG bytes, seconds)"""
+    start = time.perf_counter()
+    with matplotlib.rc_context(rc or {}):
+        fig = Figure(figsize=figsize)
+        draw(fig, data)
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', bbox_inches='tight', dpi=dpi)
+    return buf.getvalue(), time.perf_counter() - start
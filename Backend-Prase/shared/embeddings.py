@@ -0,0 +1,147 @@
+"""Whole-document embeddings from sentence-transformer chunks.
+
+MiniLM truncates its input at 256 word pieces, so encoding a resume or JD
+directly only embeds its first couple of hundred words. ``embed_documents``
+splits every text along its sections (``shared.sections``) and sentences into
+chunks of at most ``chunk_words`` words, encodes the chunks of all documents
+in one length-sorted batch (so each padded batch holds similar lengths) and
+pools them back into one unit vector per document: a mean weighted by chunk
+length (so a one-line section does not count as much as a page), or an
+element-wise max.
+
+Vectors persisted at ingest are keyed by ``text_key`` (the text with all
+whitespace removed, so extractors joining pages differently agree) and
+``embedding_version`` (model, pooling and chunking); a stored vector of any
+other version is stale and gets recomputed.
+
+    python -m shared.embeddings [batch_size]   # throughput by document length
+"""
+import hashlib
+import re
+
+import numpy as np
+
+from shared.sections import segment
+
+MINILM_MODEL = 'all-MiniLM-L6-v2'
+CHUNK_WORDS = 150  # ~200 word pieces, under MiniLM's 256 limit
+BATCH_SIZE = 32
+POOLING = ('mean', 'max')
+
+_SENTENCE_END = re.compile(r'(?<=[.!?;])\s+|\n+')
+
+
+def text_key(text):
+    return hashlib.sha256(''.join(text.split()).encode('utf-8')).hexdigest()
+
+
+def embedding_version(model_name=MINILM_MODEL, pooling='mean', chunk_words=CHUNK_WORDS):
+    return f"{model_name}/{pooling}/c{chunk_words}"
+
+
+def _sentences(text):
+    for sentence in _SENTENCE_END.split(text):
+        words = sentence.split()
+        if words:
+            yield words
+
+
+def chunk_text(text, chunk_words=CHUNK_WORDS):
+    """Section- and sentence-aligned chunks of at most ``chunk_words`` words"""
+    chunks = []
+    for section in segment(text).sections:
+        current = section.heading.split()
+        for words in _sentences(text[section.body_start:section.end]):
+            if len(current) + len(words) > chunk_words and len(words) <= chunk_words:
+                chunks.append(' '.join(current))
+                current = []
+            # A sentence longer than a chunk tops up the current one and spills over
+            while len(current) + len(words) > chunk_words:
+                room = chunk_words - len(current)
+                current.extend(words[:room])
+                chunks.append(' '.join(current))
+                current, words = [], words[room:]
+            current.extend(words)
+        if current:
+            chunks.append(' '.join(current))
+    return chunks or ['']
+
+
+def embed_documents(model, texts, pooling='mean', batch_size=BATCH_SIZE, chunk_words=CHUNK_WORDS):
+    """One unit-length embedding per text, pooled over its chunks"""
+    if pooling not in POOLING:
+        raise ValueError(f"pooling must be one of {POOLING}")
+    if not texts:
+        return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+    chunks, owners = [], []
+    for i, text in enumerate(texts):
+        document_chunks = chunk_text(text, chunk_words)
+        chunks.extend(document_chunks)
+        owners.extend([i] * len(document_chunks))
+    weights = np.array([len(chunk.split()) or 1 for chunk in chunks], dtype=np.float32)
+
+    # Longest first so every batch pads to about its own length
+    order = sorted(range(len(chunks)), key=lambda c: len(chunks[c]), reverse=True)
+    encoded = model.encode([chunks[c] for c in order], batch_size=batch_size, normalize_embeddings=True)
+    chunk_embeddings = np.empty_like(encoded)
+    chunk_embeddings[order] = encoded
+
+    # Chunks are grouped by document, so reduceat pools each document's run
+    owners = np.asarray(owners)
+    starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    if pooling == 'max':
+        pooled = np.maximum.reduceat(chunk_embeddings, starts, axis=0)
+    else:
+        pooled = np.add.reduceat(chunk_embeddings * weights[:, None], starts, axis=0)
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    return pooled / np.where(norms > 0, norms, 1)
+
+
+def embed_sections(model, text, pooling='mean', batch_size=BATCH_SIZE):
+    """{'document': vector, 'section:<name>': vector, ...} from one embed_documents call"""
+    sections = segment(text)
+    bodies = {}
+    for name in sections.names:
+        if name != 'header' and name not in bodies:
+            body = sections.body(name)
+            if body.strip():
+                bodies[name] = body
+    vectors = embed_documents(model, [text, *bodies.values()], pooling, batch_size)
+    return {'document': vectors[0], **{f'section:{name}': vector for name, vector in zip(bodies, vectors[1:])}}
+
+
+def benchmark(model, lengths=(100, 400, 1500, 5000), n_docs=32, batch_size=BATCH_SIZE):
+    """Documents per second for truncated whole-text encoding vs chunked embedding"""
+    import time
+
+    sentence = ("Built and deployed Python microservices on AWS with Docker, "
+                "improving reporting latency for the analytics team. ")
+    results = []
+    for n_words in lengths:
+        text = ' '.join((sentence * (n_words // 16 + 1)).split()[:n_words])
+        docs = [f"Experience\n{text}" for _ in range(n_docs)]
+        timings = {}
+        for label, run in (
+            ('truncated', lambda: model.encode(docs, batch_size=batch_size, normalize_embeddings=True)),
+            ('chunked mean', lambda: embed_documents(model, docs, 'mean', batch_size)),
+            ('chunked max', lambda: embed_documents(model, docs, 'max', batch_size)),
+        ):
+            start = time.perf_counter()
+            run()
+            timings[label] = n_docs / (time.perf_counter() - start)
+        results.append((n_words, len(chunk_text(docs[0])), timings))
+    return results
+
+
+if __name__ == '__main__':
+    import sys
+
+    from sentence_transformers import SentenceTransformer
+
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else BATCH_SIZE
+    model = SentenceTransformer('all-MiniLM-L6-v2')
+    model.encode(["warm up"])
+    for n_words, n_chunks, timings in benchmark(model, batch_size=batch_size):
+        print(f"{n_words:>5} words ({n_chunks:>2} chunks): "
+              + "  ".join(f"{label} {docs:7.1f} docs/s" for label, docs in timings.items()))
@@ -0,0 +1,230 @@
+"""Bounded on-disk image store with an in-memory LRU index.
+
+The directory is scanned once, on first use (so importing a service starts
+no threads and touches no files); after that every file's size and
+recency live in an OrderedDict, so adding, touching and choosing eviction
+victims are O(1) and no request lists or stats the directory. Victims leave
+the index immediately and are unlinked by a background thread, unless they
+were stored again in the meantime.
+
+Charts are stored under the hash of their bytes (``put_content``), so a URL
+always names the same image: ``install_image_routes`` serves them with a
+strong ETag and ``Cache-Control: immutable`` and answers revalidations with
+304, while recently served bytes stay in a small memory cache. Files stored
+under any other name (charts saved before content addressing) can change
+under the same name and are served with ``no-cache``.
+"""
+import hashlib
+import logging
+import mimetypes
+import os
+import queue
+import re
+import threading
+from collections import OrderedDict
+
+from flask import Response, jsonify, request
+
+logger = logging.getLogger(__name__)
+
+MAX_FILES = 500
+MAX_BYTES = 100 * 1024 * 1024
+HOT_BYTES = 8 * 1024 * 1024
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+CONTENT_NAME = re.compile(r'[0-9a-f]{32}\.(?:png|jpg|jpeg)')  # put_content filenames
+
+
+class ImageStore:
+    def __init__(self, directory, max_files=MAX_FILES, max_bytes=MAX_BYTES, hot_bytes=HOT_BYTES):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.hot_bytes = hot_bytes
+
+        self._index = OrderedDict()  # filename -> size, least recently used first
+        self._bytes = 0
+        self._hot = OrderedDict()  # filename -> bytes of recently served images
+        self._hot_size = 0
+        self.hot_hits = 0
+        self.disk_reads = 0
+        self._lock = threading.Lock()
+        self._evictions = queue.Queue()
+        self.writes = 0
+        self.evicted = 0
+        self._evictor = None
+        self._start_lock = threading.Lock()
+
+    def _start(self):
+        """Index the directory and start the evictor thread, once"""
+        if self._evictor is not None:
+            return
+        with self._start_lock:
+            if self._evictor is not None:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            existing = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    stat = entry.stat()
+                    existing.append((stat.st_mtime, entry.name, stat.st_size))
+            with self._lock:
+                for _, name, size in sorted(existing):
+                    self._index[name] = size
+                    self._bytes += size
+
+            evictor = threading.Thread(target=self._run_evictions, name="image-evictor", daemon=True)
+            evictor.start()
+            self._evictor = evictor
+        self._evict_over_budget()
+
+    def put(self, filename, data: bytes) -> str:
+        """Write the image bytes under ``filename`` and return its path"""
+        self._start()
+        path = os.path.join(self.directory, filename)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+
+        # Renamed into place under the lock, together with the index update,
+        # so the evictor never sees a new file that is not yet indexed
+        with self._lock:
+            os.replace(tmp_path, path)
+            self._bytes += len(data) - self._index.pop(filename, 0)
+            self._index[filename] = len(data)
+            self.writes += 1
+        self._evict_over_budget()
+        return path
+
+    def put_content(self, data: bytes, extension='.png') -> str:
+        """Store the bytes under their content hash and return the filename"""
+        filename = hashlib.sha256(data).hexdigest()[:32] + extension
+        self._start()
+        with self._lock:
+            known = filename in self._index
+            if known:
+                self._index.move_to_end(filename)
+        if not known:
+            self.put(filename, data)
+        self._remember_hot(filename, data)
+        return filename
+
+    def read(self, filename):
+        """Bytes of a stored image, from the hot cache when possible, or None"""
+        self._start()
+        with self._lock:
+            if filename not in self._index:
+                return None
+            self._index.move_to_end(filename)
+            data = self._hot.get(filename)
+            if data is not None:
+                self._hot.move_to_end(filename)
+                self.hot_hits += 1
+                return data
+            self.disk_reads += 1
+        try:
+            with open(os.path.join(self.directory, filename), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        self._remember_hot(filename, data)
+        return data
+
+    def _remember_hot(self, filename, data):
+        if len(data) > self.hot_bytes:
+            return
+        with self._lock:
+            self._hot_size += len(data) - len(self._hot.pop(filename, b''))
+            self._hot[filename] = data
+            while self._hot_size > self.hot_bytes:
+                _, evicted = self._hot.popitem(last=False)
+                self._hot_size -= len(evicted)
+
+    def path(self, filename):
+        """Path of a stored image (marking it recently used), or None"""
+        self._start()
+        with self._lock:
+            if filename not in self._index:
+                return None
+            self._index.move_to_end(filename)
+        return os.path.join(self.directory, filename)
+
+    def __contains__(self, filename):
+        self._start()
+        with self._lock:
+            return filename in self._index
+
+    def _evict_over_budget(self):
+        with self._lock:
+            while self._index and (len(self._index) > self.max_files or self._bytes > self.max_bytes):
+                filename, size = self._index.popitem(last=False)
+                self._bytes -= size
+                self._hot_size -= len(self._hot.pop(filename, b''))
+                self.evicted += 1
+                self._evictions.put(filename)
+
+    def _run_evictions(self):
+        while True:
+            filename = self._evictions.get()
+            try:
+                with self._lock:
+                    # Stored again since it was evicted: the file is live
+                    if filename in self._index:
+                        continue
+                    os.remove(os.path.join(self.directory, filename))
+                logger.debug(f"Removed old image: {filename}")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.error(f"Error removing {filename}: {str(e)}")
+
+    def stats(self):
+        self._start()
+        with self._lock:
+            return {
+                'files': len(self._index),
+                'bytes': self._bytes,
+                'max_files': self.max_files,
+                'max_bytes': self.max_bytes,
+                'writes': self.writes,
+                'evicted': self.evicted,
+                'pending_removals': self._evictions.qsize(),
+                'hot_files': len(self._hot),
+                'hot_bytes': self._hot_size,
+                'hot_hits': self.hot_hits,
+                'disk_reads': self.disk_reads,
+            }
+
+
+def image_response(store, filename):
+    """Serve an image; content-hashed names get a strong ETag and immutable caching"""
+    if '/' in filename or '\\' in filename or '..' in filename:
+        return jsonify({"error": "Invalid filename"}), 400
+    if not filename.lower().endswith(IMAGE_EXTENSIONS):
+        return jsonify({"error": "Invalid file type"}), 400
+
+    # A content-hashed filename doubles as the ETag
+    etag = os.path.splitext(filename)[0] if CONTENT_NAME.fullmatch(filename) else None
+    if etag and request.if_none_match.contains_weak(etag) and filename in store:
+        response = Response(status=304)
+    else:
+        data = store.read(filename)
+        if data is None:
+            return jsonify({"error": "Image not found"}), 404
+        response = Response(data, mimetype=mimetypes.guess_type(filename)[0])
+    if etag:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = IMMUTABLE
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+def install_image_routes(app, store, rule='/api/images/<filename>'):
+    """Serve ``store`` under ``rule`` (one image route per service)"""
+
+    def serve_image(filename):
+        return image_response(store, filename)
+
+    app.add_url_rule(rule, 'serve_image', serve_image, methods=['GET'])
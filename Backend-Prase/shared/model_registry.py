@@ -0,0 +1,107 @@
+"""Lazy model registry with background warm-up and health endpoints.
+
+Services register a loader per model instead of loading at import time. A
+model is loaded on first ``get`` or by ``warm_up``, whichever comes first,
+and only models that are registered (i.e. actually used) are ever loaded.
+"""
+import logging
+import threading
+import time
+
+from flask import jsonify
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._locks = {}
+        self._load_seconds = {}
+        self._errors = {}
+        self.warming = False
+
+    def register(self, name, loader):
+        """Register a zero-argument loader; nothing is loaded yet"""
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+
+    def get(self, name):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._locks[name]:
+            if name not in self._models:
+                logger.info(f"Loading model '{name}'")
+                start = time.perf_counter()
+                try:
+                    self._models[name] = self._loaders[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._load_seconds[name] = round(time.perf_counter() - start, 2)
+                self._errors.pop(name, None)
+                logger.info(f"Loaded model '{name}' in {self._load_seconds[name]}s")
+        return self._models[name]
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def warm_up(self, names=None, background=True):
+        """Load the given (default: all) models, in a daemon thread by default"""
+        names = list(names or self._loaders)
+
+        def run():
+            self.warming = True
+            try:
+                for name in names:
+                    try:
+                        self.get(name)
+                    except Exception as e:
+                        logger.error(f"Warm-up of '{name}' failed: {e}")
+            finally:
+                self.warming = False
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def ready(self):
+        return all(name in self._models for name in self._loaders)
+
+    def status(self):
+        return {
+            name: {
+                "loaded": name in self._models,
+                "load_seconds": self._load_seconds.get(name),
+                "error": self._errors.get(name),
+            }
+            for name in self._loaders
+        }
+
+
+# One registry per process
+models = ModelRegistry()
+
+
+def install_health_routes(app, registry=models):
+    """Add /healthz (process is up) and /readyz (every registered model is resident)"""
+
+    def healthz():
+        return jsonify({"status": "ok", "models": registry.status()}), 200
+
+    def readyz():
+        ready = registry.ready()
+        body = {
+            "ready": ready,
+            "warming_up": registry.warming,
+            "models": registry.status(),
+        }
+        return jsonify(body), 200 if ready else 503
+
+    app.add_url_rule("/healthz", "healthz", healthz, methods=["GET"])
+    app.add_url_rule("/readyz", "readyz", readyz, methods=["GET"])
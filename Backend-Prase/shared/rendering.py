@@ -0,0 +1,209 @@
+"""Chart rendering in a process pool with a content-addressed PNG cache.
+
+Chart code is a module-level ``draw(fig, data)`` function that draws on a
+``matplotlib.figure.Figure`` through the object-oriented API; it never
+touches pyplot, so figures are not shared through global state. Workers are
+separate processes, so rendering does not hold the request thread's GIL.
+They start from ``shared._render_worker`` (matplotlib only) rather than the
+service's main module; see ``shared.worker_processes``.
+
+Rendered PNGs are cached under a hash of the draw function and its inputs:
+the same skill set yields the same key and is served without re-rendering.
+
+Clients that draw charts themselves send ``charts=data`` (query string, form
+field or JSON body) and get the chart series instead; nothing is rendered.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from shared.worker_processes import spawn_context
+
+logger = logging.getLogger(__name__)
+
+CHART_WORKERS = 2
+CACHE_MAX_ITEMS = 256
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+RENDER_TIMEOUT = 30  # seconds
+DEFAULT_FIGSIZE = (6.4, 4.8)
+DEFAULT_DPI = 100
+WORKER_MAIN = 'shared._render_worker'
+
+
+def chart_key(draw, data, figsize, dpi, rc=None):
+    """Content hash of everything that determines the rendered image"""
+    payload = json.dumps(
+        [f"{draw.__module__}.{draw.__qualname__}", data, list(figsize), dpi, rc],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def chart_mode(req):
+    """'data' when the request opted into chart series instead of images, else 'png'"""
+    mode = req.args.get('charts') or req.form.get('charts')
+    if mode is None and req.is_json:
+        mode = (req.get_json(silent=True) or {}).get('charts')
+    return 'data' if mode == 'data' else 'png'
+
+
+def chart_data(charts):
+    """The data half of ``{name: (draw, data, options)}`` chart jobs"""
+    return {name: data for name, (draw, data, options) in charts.items()}
+
+
+def render_png(draw, data, figsize, dpi, rc=None):
+    """Draw one chart on a fresh Figure and return (PNG bytes, seconds)"""
+    from shared._render_worker import render_png
+    return render_png(draw, data, figsize, dpi, rc)
+
+
+class ChartRenderer:
+    """Renders charts in worker processes and caches the PNG bytes.
+
+    ``workers=0`` renders on the calling thread instead, which is still safe
+    because every chart gets its own Figure.
+    """
+
+    def __init__(self, workers=CHART_WORKERS, max_items=CACHE_MAX_ITEMS,
+                 max_bytes=CACHE_MAX_BYTES, latency_window=1000):
+        self.workers = workers
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+
+        self._pool = None
+        self._cache = OrderedDict()  # key -> png bytes
+        self._cache_bytes = 0
+        self._pending = {}  # key -> Future shared by identical in-flight renders
+        self._lock = threading.Lock()
+        self._counters = Counter()
+        self._render_times = deque(maxlen=latency_window)
+        self._per_chart = {}  # chart name -> [renders, total seconds]
+
+    def _executor(self):
+        if self._pool is None:
+            # Spawned from the lean worker module: no fork of a process that
+            # holds the service's threads and locks, and no re-import of the
+            # service (its models, stores and threads) in every worker
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=spawn_context(WORKER_MAIN))
+        return self._pool
+
+    def render(self, draw, data, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI, rc=None):
+        """Return the PNG bytes for ``draw(fig, data)``, from cache when possible"""
+        return self._submit(draw, data, figsize, dpi, rc).result(timeout=RENDER_TIMEOUT)
+
+    def render_many(self, charts):
+        """Render ``{name: (draw, data, options)}`` concurrently, returning ``{name: png}``
+
+        ``options`` are the keyword arguments of ``render`` (figsize, dpi, rc).
+        """
+        futures = {name: self._submit(draw, data, **options) for name, (draw, data, options) in charts.items()}
+        return {name: future.result(timeout=RENDER_TIMEOUT) for name, future in futures.items()}
+
+    def _submit(self, draw, data, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI, rc=None):
+        key = chart_key(draw, data, figsize, dpi, rc)
+        with self._lock:
+            png = self._cache.get(key)
+            if png is not None:
+                self._cache.move_to_end(key)
+                self._counters['hits'] += 1
+                future = Future()
+                future.set_result(png)
+                return future
+            pending = self._pending.get(key)
+            if pending is not None:
+                self._counters['coalesced'] += 1
+                return pending
+            self._counters['misses'] += 1
+            result = Future()
+            self._pending[key] = result
+
+        name = draw.__name__
+        start = time.perf_counter()
+        try:
+            if self.workers:
+                from shared._render_worker import render_png as worker_render
+                try:
+                    job = self._executor().submit(worker_render, draw, data, figsize, dpi, rc)
+                except BrokenProcessPool:
+                    logger.warning("Chart worker pool broke, restarting it")
+                    self._pool = None
+                    job = self._executor().submit(worker_render, draw, data, figsize, dpi, rc)
+            else:
+                job = Future()
+                job.set_result(render_png(draw, data, figsize, dpi, rc))
+        except Exception as e:
+            self._finish(key, result, name, start, error=e)
+            return result
+
+        def on_done(done):
+            error = done.exception()
+            if error is not None:
+                self._finish(key, result, name, start, error=error)
+            else:
+                self._finish(key, result, name, start, *done.result())
+
+        job.add_done_callback(on_done)
+        return result
+
+    def _finish(self, key, result, name, start, png=None, draw_seconds=0.0, error=None):
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._pending.pop(key, None)
+            if error is not None:
+                self._counters['errors'] += 1
+            else:
+                self._render_times.append(elapsed)
+                totals = self._per_chart.setdefault(name, [0, 0.0])
+                totals[0] += 1
+                totals[1] += draw_seconds
+                self._cache[key] = png
+                self._cache_bytes += len(png)
+                while self._cache and (len(self._cache) > self.max_items
+                                       or self._cache_bytes > self.max_bytes):
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cache_bytes -= len(evicted)
+                    self._counters['evictions'] += 1
+        if error is not None:
+            logger.error(f"Rendering chart '{name}' failed: {error}")
+            result.set_exception(error)
+        else:
+            result.set_result(png)
+
+    def stats(self):
+        """Cache hit rate, per-chart draw time and render latency percentiles.
+
+        ``avg_render_ms`` is the time spent drawing in the worker; the p50/p99
+        latencies also include queueing and transfer from the pool.
+        """
+        with self._lock:
+            times = sorted(self._render_times)
+            lookups = self._counters['hits'] + self._counters['misses']
+            stats = {
+                'hits': self._counters['hits'],
+                'misses': self._counters['misses'],
+                'coalesced': self._counters['coalesced'],
+                'errors': self._counters['errors'],
+                'evictions': self._counters['evictions'],
+                'hit_rate': round(self._counters['hits'] / lookups, 3) if lookups else 0,
+                'cached_charts': len(self._cache),
+                'cached_bytes': self._cache_bytes,
+                'in_flight': len(self._pending),
+                'workers': self.workers,
+                'avg_render_ms': {
+                    name: round(total / count * 1000, 2)
+                    for name, (count, total) in self._per_chart.items()
+                },
+            }
+        for name, q in (('p50_ms', 0.50), ('p99_ms', 0.99)):
+            stats[name] = round(times[int(q * (len(times) - 1))] * 1000, 2) if times else 0
+        return stats
+
+
+# One renderer (and worker pool) per service process
+renderer = ChartRenderer()
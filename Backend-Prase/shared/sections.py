@@ -0,0 +1,109 @@
+"""Single-pass, line-based resume section segmenter.
+
+A heading is a short line that names a known section ("Work Experience",
+"SKILLS:", "• Certifications"), or a line that starts with one followed by
+a colon ("Skills: Python, SQL"). The text is walked line by line once; each
+section runs from its heading to the next one, and whatever precedes the
+first heading is the ``header`` section (name and contact details).
+
+``segment`` caches the result per document text, so Dash's per-section
+extraction, Compare's completeness score and ATS's education/experience
+detection share one pass (and one lower-cased copy) of the same resume.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# canonical section -> heading spellings (lower case)
+SECTION_HEADINGS = {
+    'objective': ['objective', 'career objective', 'professional objective'],
+    'summary': ['summary', 'professional summary', 'profile', 'about me', 'career summary'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core competencies', 'skills & tools'],
+    'experience': ['experience', 'work experience', 'professional experience', 'work history',
+                   'employment history', 'internships', 'internship experience'],
+    'education': ['education', 'academic background', 'academics', 'education & training'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects'],
+    'certifications': ['certifications', 'certificates', 'licenses & certifications',
+                       'licenses and certifications', 'courses & certifications'],
+    'achievements': ['achievements', 'awards', 'honors & awards', 'accomplishments'],
+    'publications': ['publications'],
+    'interests': ['interests', 'hobbies', 'hobbies & interests'],
+}
+HEADER = 'header'
+MAX_HEADING_CHARS = 40
+SEGMENT_CACHE_SIZE = 128
+
+HEADINGS = {alias: name for name, aliases in SECTION_HEADINGS.items() for alias in aliases}
+_STRIP = ' \t\r\n•·-–—*#|>:'
+_SPACES = re.compile(r'\s+')
+
+# start: heading offset, body_start: first character of the body, end: exclusive
+Section = namedtuple('Section', ['name', 'heading', 'start', 'body_start', 'end'])
+
+
+def section_name(heading):
+    """Canonical section for a heading spelling, or None"""
+    key = heading.strip(_STRIP).lower()
+    name = HEADINGS.get(key)
+    if name is None and ('  ' in key or '\t' in key):
+        name = HEADINGS.get(_SPACES.sub(' ', key))
+    return name
+
+
+def _heading(line):
+    """(section, body offset within the line) if the line is a heading"""
+    if len(line) <= MAX_HEADING_CHARS + 4:
+        name = section_name(line)
+        if name:
+            return name, len(line)
+    colon = line.find(':', 0, MAX_HEADING_CHARS + 4)
+    if colon != -1:
+        name = section_name(line[:colon])
+        if name:
+            return name, colon + 1
+    return None
+
+
+class ResumeSections:
+    def __init__(self, text):
+        self.text = text
+        self.lower = text.lower()
+        sections = []
+        name, heading, start, body_start = HEADER, '', 0, 0
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            found = _heading(line)
+            if found:
+                sections.append(Section(name, heading, start, body_start, offset))
+                name, body_offset = found
+                heading = line[:body_offset].strip(_STRIP)
+                start, body_start = offset, offset + body_offset
+            offset += len(line)
+        sections.append(Section(name, heading, start, body_start, offset))
+        # An empty header (text starts with a heading) is not a section
+        self.sections = tuple(s for s in sections if s.name != HEADER or s.end > s.start)
+
+    def __contains__(self, name):
+        return any(s.name == name for s in self.sections)
+
+    @property
+    def names(self):
+        return [s.name for s in self.sections]
+
+    def get(self, name):
+        return [s for s in self.sections if s.name == name]
+
+    def body(self, name, lower=False):
+        """Text of every section called ``name``, joined by newlines"""
+        body = "\n".join(self.text[s.body_start:s.end] for s in self.get(name))
+        return body.lower() if lower else body
+
+    def lines(self, name):
+        """Non-empty body lines of a section with bullets stripped"""
+        return [line.strip("•- \t") for line in self.body(name).splitlines() if line.strip("•- \t")]
+
+
+@lru_cache(maxsize=SEGMENT_CACHE_SIZE)
+def segment(text):
+    """Sections of a resume text, computed once per distinct text"""
+    return ResumeSections(text)
@@ -0,0 +1,249 @@
+"""Canonical skill taxonomy with a single-pass Aho-Corasick matcher.
+
+Every skill has one canonical name (its lower-cased display name), a
+category and optional aliases. All names are compiled once into an
+Aho-Corasick automaton over word tokens, so a text is tokenized and scanned
+exactly once no matter how many skills there are, and a skill only matches
+whole words ("java" does not match inside "javascript", "go" not inside
+"google"). Tokens skip whitespace, so "machine\\nlearning" and "c + +" match.
+
+Services keep their own groupings (e.g. Analyze's tech categories) as lists
+of skill names; ``group`` resolves them against the taxonomy.
+
+    python -m shared.skills    # benchmark against the per-keyword loops
+
+The old ``kw in text`` loops cost one scan per keyword and match inside
+words; the per-keyword ``\\b`` regexes are correct but an order of magnitude
+slower. One automaton pass is as fast as the substring loops at today's
+taxonomy size and stays flat as skills and aliases are added.
+"""
+import re
+from collections import namedtuple
+
+# category -> [(display name, aliases)]
+TAXONOMY = {
+    'language': [
+        ('Python', ()), ('Java', ()), ('JavaScript', ('js', 'ecmascript')),
+        ('TypeScript', ()), ('C++', ('cpp',)), ('C#', ('csharp',)), ('Go', ('golang',)),
+        ('Rust', ()), ('Swift', ()), ('Kotlin', ()), ('PHP', ()), ('Ruby', ()), ('Scala', ()),
+    ],
+    'frontend': [
+        ('HTML', ('html5',)), ('CSS', ('css3',)), ('React', ('react.js', 'reactjs')),
+        ('Angular', ('angularjs',)), ('Vue', ('vue.js', 'vuejs')), ('Bootstrap', ()),
+        ('Tailwind', ('tailwindcss', 'tailwind css')),
+    ],
+    'backend': [
+        ('Node.js', ('nodejs', 'node')), ('Express', ('express.js', 'expressjs')),
+        ('Django', ()), ('Flask', ()), ('FastAPI', ()), ('Spring', ('spring boot',)),
+        ('Ruby on Rails', ('rails',)),
+    ],
+    'database': [
+        ('SQL', ()), ('MySQL', ()), ('PostgreSQL', ('postgres',)), ('MongoDB', ('mongo',)),
+        ('SQLite', ()), ('Oracle', ()), ('Firebase', ()),
+    ],
+    'devops': [
+        ('Docker', ()), ('Kubernetes', ('k8s',)), ('Jenkins', ()), ('Terraform', ()),
+        ('Ansible', ()), ('GitHub Actions', ()), ('CI/CD', ('cicd', 'ci-cd')),
+    ],
+    'cloud': [
+        ('AWS', ('amazon web services',)), ('Azure', ('microsoft azure',)),
+        ('GCP', ('google cloud', 'google cloud platform')), ('Lambda', ()), ('EC2', ()), ('S3', ()),
+    ],
+    'data': [
+        ('Pandas', ()), ('NumPy', ()), ('Spark', ('apache spark', 'pyspark')),
+        ('Hadoop', ()), ('Tableau', ()),
+    ],
+    'ml': [
+        ('Machine Learning', ('ml',)), ('Deep Learning', ()),
+        ('NLP', ('natural language processing',)), ('TensorFlow', ()), ('PyTorch', ()),
+        ('Keras', ()), ('Scikit-learn', ('sklearn', 'scikit learn')),
+    ],
+    'mobile': [
+        ('Android', ()), ('iOS', ()), ('Flutter', ()), ('React Native', ()), ('Xamarin', ()),
+    ],
+    'tools': [
+        ('Git', ()), ('Linux', ()), ('VS Code', ('vscode', 'visual studio code')),
+    ],
+    'design': [
+        ('Figma', ()), ('Adobe XD', ()), ('Sketch', ()), ('Wireframing', ()), ('Prototyping', ()),
+    ],
+    'fundamentals': [
+        ('Data Structures and Algorithms', ('dsa', 'data structures & algorithms')),
+        ('Operating System', ('operating systems',)),
+        ('Computer Networking', ('computer networks',)),
+    ],
+    'soft': [
+        ('Communication', ()), ('Leadership', ()), ('Collaboration', ()), ('Teamwork', ()),
+        ('Problem Solving', ('problem-solving',)),
+    ],
+}
+
+TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+SkillHit = namedtuple('SkillHit', ['skill', 'category', 'start', 'end'])
+
+
+def tokenize(text):
+    return tuple(TOKEN_PATTERN.findall(text.lower()))
+
+
+class SkillTaxonomy:
+    def __init__(self, taxonomy=TAXONOMY):
+        self.categories = {}  # canonical skill -> category
+        self.displays = {}    # canonical skill -> display name
+        self.names = {}       # any lower-cased name or alias -> canonical skill
+        for category, entries in taxonomy.items():
+            for display, aliases in entries:
+                skill = display.lower()
+                self.categories[skill] = category
+                self.displays[skill] = display
+                for name in (skill, *aliases):
+                    self.names[name.lower()] = skill
+
+        # Aho-Corasick automaton over tokens: goto, failure links and, per
+        # state, the (skill, length in tokens) of every name ending there,
+        # longest first
+        self._goto = [{}]
+        self._outputs = [[]]
+        for name, skill in self.names.items():
+            state = 0
+            tokens = tokenize(name)
+            for token in tokens:
+                next_state = self._goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][token] = next_state
+                    self._goto.append({})
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append((skill, len(tokens)))
+
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def canonical(self, name):
+        """Canonical skill for a display name or alias, or None"""
+        return self.names.get(name.lower().strip())
+
+    def display(self, skill):
+        return self.displays.get(skill, skill)
+
+    def category(self, skill):
+        return self.categories.get(skill)
+
+    def find(self, text):
+        """Every skill mention in ``text`` as SkillHit(skill, category, start, end)"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        root = goto[0]
+        hits = []
+        spans = []
+        state = 0
+        for match in TOKEN_PATTERN.finditer(text.lower()):
+            token = match.group()
+            spans.append(match.span())
+            if state:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+            else:
+                state = root.get(token, 0)
+            for skill, length in outputs[state]:
+                hits.append(SkillHit(skill, self.categories[skill],
+                                     spans[-length][0], spans[-1][1]))
+        hits.sort(key=lambda hit: (hit.start, -hit.end))
+        return hits
+
+    def skills(self, text):
+        """Distinct canonical skills in ``text``, in order of first mention.
+
+        Same scan as ``find`` without tracking positions, which keeps the
+        common "which skills are there" question as cheap as one tokenize.
+        Only the longest name ending at a token counts, so "Node.js" is not
+        also JavaScript and "Tailwind CSS" is not also CSS.
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        root = goto[0]
+        found = {}
+        state = 0
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            if state:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+            else:
+                state = root.get(token, 0)
+                if not state:
+                    continue
+            if outputs[state]:
+                found[outputs[state][0][0]] = None
+        return list(found)
+
+    def group(self, found, groups):
+        """Split found skills by a service's own ``{group: [skill names]}`` view"""
+        found = set(found)
+        return {
+            name: [skill for skill in members if self.canonical(skill) in found]
+            for name, members in groups.items()
+        }
+
+
+# Compiled once per process
+taxonomy = SkillTaxonomy()
+
+
+def _legacy_substring(text, names):
+    text = text.lower()
+    return [name for name in names if name in text]
+
+
+def _legacy_regex(text, names):
+    return [name for name in names if re.search(r'\b' + re.escape(name) + r'\b', text, re.IGNORECASE)]
+
+
+def benchmark(sizes=(5_000, 50_000), repeats=5):
+    """Time the legacy per-keyword loops against one automaton pass"""
+    import time
+
+    skills_paragraph = (
+        "Software engineer with 5 years of experience building Python and Java services. "
+        "Worked with React, Node.js and PostgreSQL; deployed on AWS with Docker and Kubernetes. "
+        "Built machine learning pipelines in TensorFlow and scikit-learn, strong communication "
+        "and problem-solving skills, CI/CD with GitHub Actions. "
+    )
+    prose = (
+        "Led a team of four engineers and owned the quarterly roadmap for the billing platform. "
+        "Reduced incident response time by introducing on-call runbooks and weekly reviews. "
+        "Mentored interns, ran hiring interviews and presented results to senior leadership. "
+    )
+    names = list(taxonomy.names)
+    results = []
+    for size in sizes:
+        chunk = skills_paragraph + prose * 3
+        text = (chunk * (size // len(chunk) + 1))[:size]
+        timings = {}
+        for label, run in (('substring', lambda: _legacy_substring(text, names)),
+                           ('regex', lambda: _legacy_regex(text, names)),
+                           ('skills()', lambda: taxonomy.skills(text)),
+                           ('find()', lambda: taxonomy.find(text))):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                run()
+            timings[label] = (time.perf_counter() - start) / repeats * 1000
+        results.append((size, timings))
+    return len(names), results
+
+
+if __name__ == '__main__':
+    n_names, results = benchmark()
+    print(f"{n_names} skill names and aliases")
+    for size, timings in results:
+        print(f"{size:>7} chars: " + "  ".join(f"{k} {v:8.2f} ms" for k, v in timings.items()))
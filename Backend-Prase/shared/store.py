@@ -0,0 +1,234 @@
+"""SQLite storage for parsed resumes and analysis history.
+
+Replaces the per-user ``parsed_data/<email>.json`` files, which every service
+rewrote in full on each request. Each kind of record lives in its own table
+and is appended with a single INSERT; reads go through an (email, created_at)
+index. Users are keyed the same way the JSON files were named.
+
+Resume embeddings computed at ingest are stored as float32 blobs keyed by
+(text hash, model version, kind), so any service that sees the same resume
+text can load them instead of encoding it again. Only ingested texts are
+stored; one-off texts a service encodes for a single request are not.
+
+One-shot import of the existing JSON files:
+
+    python -m shared.store migrate [parsed_data_folder]
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARSED_DATA_FOLDER = os.path.join(BASE_DIR, "parsed_data")
+DEFAULT_DB_PATH = os.path.join(PARSED_DATA_FOLDER, "skillbridge.db")
+
+TABLES = ("resumes", "gap", "gap_analyses")
+
+
+def email_key(email: str) -> str:
+    """Same key the JSON files used for their names"""
+    return email.strip().replace("@", "_at_").replace(".", "_")
+
+
+class ResumeStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        conn = self._conn()
+        for table in TABLES:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    email_key TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+            """)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_email ON {table} (email_key, created_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                text_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (text_hash, model, kind)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS migrations (
+                source TEXT PRIMARY KEY,
+                migrated_at TEXT NOT NULL
+            )
+        """)
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _append(self, table, email, data, created_at=None):
+        created_at = created_at or data.get("timestamp") or datetime.now().isoformat()
+        conn = self._conn()
+        with conn:
+            cursor = conn.execute(
+                f"INSERT INTO {table} (email_key, created_at, data) VALUES (?, ?, ?)",
+                (email_key(email), created_at, json.dumps(data))
+            )
+        return cursor.lastrowid
+
+    def _list(self, table, email, limit=None):
+        """Newest first"""
+        rows = self._conn().execute(
+            f"SELECT data FROM {table} WHERE email_key = ? ORDER BY created_at DESC, id DESC LIMIT ?",
+            (email_key(email), -1 if limit is None else limit)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _latest(self, table, email):
+        rows = self._list(table, email, limit=1)
+        return rows[0] if rows else None
+
+    # Parsed resumes (/api/resume-parser)
+    def save_resume(self, email, structured):
+        return self._append("resumes", email, structured)
+
+    def latest_resume(self, email):
+        return self._latest("resumes", email)
+
+    # Skill gap entries (/api/analyze)
+    def append_gap(self, email, entry):
+        return self._append("gap", email, entry)
+
+    def latest_gap(self, email):
+        return self._latest("gap", email)
+
+    def list_gaps(self, email, limit=None):
+        return self._list("gap", email, limit)
+
+    # Learning-path analyses (/api/learn)
+    def append_gap_analysis(self, email, analysis):
+        return self._append("gap_analyses", email, analysis)
+
+    def list_gap_analyses(self, email, limit=None):
+        return self._list("gap_analyses", email, limit)
+
+    # Embeddings ("document" or "section:<name>"), per text hash and model version
+    def save_embeddings(self, text_hash, model, vectors):
+        """Store {kind: vector} for one text, replacing older rows of the same version"""
+        created_at = datetime.now().isoformat()
+        rows = []
+        for kind, vector in vectors.items():
+            vector = np.asarray(vector, dtype=np.float32)
+            rows.append((text_hash, model, kind, vector.shape[-1], vector.tobytes(), created_at))
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (text_hash, model, kind, dim, vector, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def load_embeddings(self, text_hashes, model, kind="document"):
+        """{text_hash: vector} for the hashes stored under this model version"""
+        text_hashes = list(dict.fromkeys(text_hashes))
+        found = {}
+        for start in range(0, len(text_hashes), 500):  # stay under SQLite's parameter limit
+            batch = text_hashes[start:start + 500]
+            rows = self._conn().execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND kind = ? "
+                f"AND text_hash IN ({', '.join('?' * len(batch))})",
+                (model, kind, *batch)
+            ).fetchall()
+            found.update((text_hash, np.frombuffer(vector, dtype=np.float32)) for text_hash, vector in rows)
+        return found
+
+    def embedded_text_hashes(self, text_hashes):
+        """The subset of ``text_hashes`` with embeddings stored under any model version"""
+        text_hashes = list(dict.fromkeys(text_hashes))
+        found = set()
+        for start in range(0, len(text_hashes), 500):  # stay under SQLite's parameter limit
+            batch = text_hashes[start:start + 500]
+            rows = self._conn().execute(
+                f"SELECT DISTINCT text_hash FROM embeddings WHERE text_hash IN ({', '.join('?' * len(batch))})",
+                batch
+            ).fetchall()
+            found.update(text_hash for (text_hash,) in rows)
+        return found
+
+    def load_all_embeddings(self, text_hash, model):
+        """{kind: vector} of every embedding stored for one text"""
+        rows = self._conn().execute(
+            "SELECT kind, vector FROM embeddings WHERE text_hash = ? AND model = ?", (text_hash, model)
+        ).fetchall()
+        return {kind: np.frombuffer(vector, dtype=np.float32) for kind, vector in rows}
+
+    def migrate_json_folder(self, folder=PARSED_DATA_FOLDER):
+        """Import every <email>.json file once; returns rows imported per table"""
+        counts = dict.fromkeys(TABLES, 0)
+        conn = self._conn()
+        for filename in sorted(os.listdir(folder)):
+            if not filename.endswith(".json"):
+                continue
+            if conn.execute("SELECT 1 FROM migrations WHERE source = ?", (filename,)).fetchone():
+                continue
+
+            path = os.path.join(folder, filename)
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+
+            key = filename[:-len(".json")]
+            migrated_at = datetime.now().isoformat()
+            file_time = datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+            resume = {k: v for k, v in raw.items() if k not in ("gap", "gap_analyses")}
+            rows = [("gap", entry) for entry in raw.get("gap", [])]
+            rows += [("gap_analyses", entry) for entry in raw.get("gap_analyses", [])]
+            if resume:
+                rows.insert(0, ("resumes", resume))
+
+            with conn:
+                for table, data in rows:
+                    conn.execute(
+                        f"INSERT INTO {table} (email_key, created_at, data) VALUES (?, ?, ?)",
+                        (key, data.get("timestamp") or file_time, json.dumps(data))
+                    )
+                    counts[table] += 1
+                conn.execute("INSERT INTO migrations (source, migrated_at) VALUES (?, ?)",
+                             (filename, migrated_at))
+        return counts
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide store on the default database"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResumeStore()
+    return _store
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != "migrate":
+        print(__doc__)
+        sys.exit(1)
+
+    folder = sys.argv[2] if len(sys.argv) > 2 else PARSED_DATA_FOLDER
+    counts = get_store().migrate_json_folder(folder)
+    print(f"Migrated from {folder}: {counts}")
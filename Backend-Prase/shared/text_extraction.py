@@ -0,0 +1,185 @@
+"""Document text extraction shared by every service.
+
+PDFs go through PyMuPDF, DOCX through python-docx and anything else is decoded
+as plain text. Extraction works on bytes, paths or file objects and returns
+one string per page; large PDFs can be split across a process pool.
+
+Benchmark against the extractors the services used before:
+
+    python -m shared.text_extraction path/to/resumes/
+"""
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+
+from shared.worker_processes import spawn_context
+
+# PDFs with at least this many pages are extracted page-parallel by default
+PARALLEL_PAGE_THRESHOLD = 40
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_pool = None
+
+
+class UnsupportedFormatError(ValueError):
+    pass
+
+
+def _read_source(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source), None
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read(), os.fspath(source)
+    # file-like object (werkzeug FileStorage, BytesIO, open file)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source.read(), getattr(source, "filename", None) or getattr(source, "name", None)
+
+
+def detect_format(data, filename=None):
+    """Return 'pdf', 'docx' or 'txt' from the file name, falling back to magic bytes"""
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext == ".pdf" or data[:5] == b"%PDF-":
+        return "pdf"
+    if ext == ".docx" or (not ext and data[:2] == b"PK"):
+        return "docx"
+    if ext in ("", ".txt", ".text", ".md"):
+        return "txt"
+    raise UnsupportedFormatError(f"Unsupported file type '{ext}'. Use PDF, DOCX or TXT.")
+
+
+def _pdf_page_range(data, start, stop):
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        # Never fork the threaded Flask process (a lock held by another
+        # thread stays locked in the child); workers are spawned and start
+        # from this module, which imports nothing but PyMuPDF
+        _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=spawn_context('shared.text_extraction'))
+    return _pool
+
+
+def extract_pdf_pages(data, parallel=None):
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = doc.page_count
+        if parallel is None:
+            parallel = page_count >= PARALLEL_PAGE_THRESHOLD and MAX_WORKERS > 1
+        if not parallel:
+            return [page.get_text() for page in doc]
+
+    chunk = -(-page_count // MAX_WORKERS)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    futures = [_get_pool().submit(_pdf_page_range, data, start, stop) for start, stop in ranges]
+    return [text for future in futures for text in future.result()]
+
+
+def extract_docx_pages(data):
+    import docx
+
+    # python-docx has no notion of pages, so the document is a single page
+    document = docx.Document(io.BytesIO(data))
+    return ["\n".join(para.text for para in document.paragraphs)]
+
+
+def extract_txt_pages(data):
+    for encoding in ("utf-8", "latin-1"):
+        try:
+            return [data.decode(encoding)]
+        except UnicodeDecodeError:
+            continue
+
+
+def extract_pages(source, filename=None, parallel=None):
+    """Extract a list of page texts from bytes, a path or a file object"""
+    data, source_name = _read_source(source)
+    fmt = detect_format(data, filename or source_name)
+    if fmt == "pdf":
+        return extract_pdf_pages(data, parallel=parallel)
+    if fmt == "docx":
+        return extract_docx_pages(data)
+    return extract_txt_pages(data)
+
+
+def extract_text(source, filename=None, parallel=None, sep="\n"):
+    """Extract the whole document as one string"""
+    return sep.join(extract_pages(source, filename=filename, parallel=parallel))
+
+
+def _legacy_extractors():
+    """The per-service extractors this module replaced, where installed"""
+    extractors = {}
+    try:
+        import pdfplumber
+
+        def with_pdfplumber(data):
+            with pdfplumber.open(io.BytesIO(data)) as pdf:
+                return "".join(page.extract_text() or "" for page in pdf.pages)
+        extractors["pdfplumber (ATS)"] = with_pdfplumber
+    except ImportError:
+        pass
+    try:
+        import PyPDF2
+
+        def with_pypdf2(data):
+            reader = PyPDF2.PdfReader(io.BytesIO(data))
+            return " ".join(page.extract_text() or "" for page in reader.pages)
+        extractors["PyPDF2 (Compare)"] = with_pypdf2
+    except ImportError:
+        pass
+    try:
+        from pdfminer.high_level import extract_text as pdfminer_extract
+
+        extractors["pdfminer (Dash)"] = lambda data: pdfminer_extract(io.BytesIO(data))
+    except ImportError:
+        pass
+    return extractors
+
+
+def benchmark(paths, repeats=3):
+    import time
+
+    docs = []
+    for path in paths:
+        with open(path, "rb") as f:
+            docs.append(f.read())
+
+    engines = {
+        "pymupdf": lambda data: extract_text(data, filename="doc.pdf", parallel=False),
+        "pymupdf (page-parallel)": lambda data: extract_text(data, filename="doc.pdf", parallel=True),
+    }
+    engines.update(_legacy_extractors())
+
+    results = {}
+    for name, extract in engines.items():
+        extract(docs[0])  # warm-up (imports, process pool start)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            chars = sum(len(extract(data)) for data in docs)
+        elapsed = (time.perf_counter() - start) / repeats
+        results[name] = {"ms_per_doc": round(elapsed / len(docs) * 1000, 2), "chars": chars}
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    corpus = sys.argv[1]
+    paths = sorted(os.path.join(corpus, f) for f in os.listdir(corpus) if f.lower().endswith(".pdf"))
+    if not paths:
+        print(f"No PDFs found in {corpus}")
+        sys.exit(1)
+
+    print(f"{len(paths)} PDFs")
+    for name, row in benchmark(paths).items():
+        print(f"{name:>26}: {row['ms_per_doc']:>8.2f} ms/doc  {row['chars']:>8} chars")
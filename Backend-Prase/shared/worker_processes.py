@@ -0,0 +1,52 @@
+"""Process pools whose workers never import the service's ``__main__``.
+
+With the spawn start method every worker re-runs the parent's main module
+(as ``__mp_main__``) so that objects defined there can be unpickled. For a
+service that means importing its models, stores and background threads in
+each worker. The pools here only ever ship module-level functions of
+importable modules, so their workers start from a small worker module
+instead: while a worker process is being launched, that module stands in for
+``__main__`` in the preparation data the child receives.
+
+Spawned workers also never inherit locks held by the parent's threads, which
+forking a threaded Flask process can.
+"""
+import importlib
+import sys
+import threading
+from multiprocessing.context import SpawnContext, SpawnProcess
+
+_main_swap_lock = threading.Lock()
+
+
+class LeanProcess(SpawnProcess):
+    worker_main = None
+
+    @staticmethod
+    def _Popen(process_obj):
+        module = importlib.import_module(process_obj.worker_main)
+        # The child's preparation data (what it imports as its main module)
+        # is read from sys.modules['__main__'] while it is being launched
+        with _main_swap_lock:
+            main = sys.modules['__main__']
+            sys.modules['__main__'] = module
+            try:
+                return SpawnProcess._Popen(process_obj)
+            finally:
+                sys.modules['__main__'] = main
+
+
+class LeanSpawnContext(SpawnContext):
+    """Spawn context whose processes run ``worker_main`` as their main module"""
+
+    def __init__(self, worker_main):
+        self.worker_main = worker_main
+
+    def Process(self, *args, **kwargs):
+        process = LeanProcess(*args, **kwargs)
+        process.worker_main = self.worker_main
+        return process
+
+
+def spawn_context(worker_main):
+    return LeanSpawnContext(worker_main)
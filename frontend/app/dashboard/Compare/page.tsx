@@ -259,7 +259,7 @@ const SkillCompareForm: React.FC = () => {
             >
               <h2 className="text-2xl font-bold text-gray-800">Analysis Charts</h2>
               <div className="grid grid-cols-1 md:grid-cols-2 gap-6">
-                {Object.entries(compareResult.visualizations).map(([key, base64], index) => (
+                {Object.entries(compareResult.visualizations).map(([key, url], index) => (
                   <motion.div
                     key={key}
                     className="bg-white p-4 rounded-2xl shadow-md border border-gray-100 hover:shadow-lg transition-all duration-300"
@@ -273,7 +273,7 @@ const SkillCompareForm: React.FC = () => {
                     </h3>
                     <div className="h-64 flex items-center justify-center">
                       <motion.img
-                        src={`data:image/png;base64,${base64}`}
+                        src={`http://localhost:5004${url}`}
                         alt={`${key} visualization`}
                         className="max-w-full max-h-full object-contain"
                         initial={{ scale: 0.95 }}
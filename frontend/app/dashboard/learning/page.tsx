@@ -368,7 +368,7 @@ export default function LearningRoadmapPage() {
                   </CardHeader>
                   <CardContent>
                     <div className="relative aspect-square">
-                      <Image src={`data:image/png;base64,${analysisData.visualizations.skill_match}`} alt="Skill Match" fill className="object-contain" />
+                      <Image src={`http://localhost:5002${analysisData.visualizations.skill_match}`} alt="Skill Match" fill className="object-contain" />
                     </div>
                   </CardContent>
                 </Card>
@@ -378,7 +378,7 @@ export default function LearningRoadmapPage() {
                   </CardHeader>
                   <CardContent>
                     <div className="relative aspect-square">
-                      <Image src={`data:image/png;base64,${analysisData.visualizations.skill_radar}`} alt="Skill Radar" fill className="object-contain" />
+                      <Image src={`http://localhost:5002${analysisData.visualizations.skill_radar}`} alt="Skill Radar" fill className="object-contain" />
                     </div>
                   </CardContent>
                 </Card>
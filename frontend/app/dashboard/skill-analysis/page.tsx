@@ -65,13 +65,13 @@ export default function SkillAnalysisPage() {
 
   useEffect(() => {
     if (result?.images) {
-      const timestamp = Date.now()
+      // Image URLs are content-hashed, so the browser cache can be trusted
       setImageUrls({
         skillMatch: result.images.skill_match 
-          ? `http://localhost:5000${result.images.skill_match}?t=${timestamp}`
+          ? `http://localhost:5000${result.images.skill_match}`
           : undefined,
         tech_pie_chart: result.images.tech_pie_chart 
-          ? `http://localhost:5000${result.images.tech_pie_chart}?t=${timestamp}`
+          ? `http://localhost:5000${result.images.tech_pie_chart}`
           : undefined,
        
       })